@@ -9,7 +9,8 @@ config = context.config
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
-fileConfig(config.config_file_name)
+# Keep the loggers of a caller running the migrations in-process (app/prestart.py)
+fileConfig(config.config_file_name, disable_existing_loggers=False)
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -19,9 +20,12 @@ fileConfig(config.config_file_name)
 
 from app.core.config import settings  # noqa
 
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel  # noqa
 from app.api.role.domain.role_models import Role  # noqa
+from app.api.shared.infrastructure.outbox.outbox_models import OutboxMessage  # noqa
 from app.api.user.domain.user_models import User  # noqa
+from app.api.visitor.domain.visitor_models import Visitor  # noqa
+from app.core.db import CatalogVersion, SeedFingerprint  # noqa
 
 target_metadata = SQLModel.metadata
 
@@ -64,6 +68,12 @@ def run_migrations_online():
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # Reuse the connection of a caller running the migrations in-process
+        run_migrations_with_connection(connection)
+        return
+
     configuration = config.get_section(config.config_ini_section)
     configuration["sqlalchemy.url"] = get_url()
     connectable = engine_from_config(
@@ -73,12 +83,21 @@ def run_migrations_online():
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata, compare_type=True
-        )
+        run_migrations_with_connection(connection)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def run_migrations_with_connection(connection):
+    # One transaction per migration, as some of them commit early to build
+    # indexes concurrently
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        transaction_per_migration=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
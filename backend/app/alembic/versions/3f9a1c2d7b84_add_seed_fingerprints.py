@@ -0,0 +1,29 @@
+"""Add seed fingerprints
+
+Revision ID: 3f9a1c2d7b84
+Revises: 764bda187091
+Create Date: 2026-10-19 09:12:04.518233
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3f9a1c2d7b84"
+down_revision = "764bda187091"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "seed_fingerprints",
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("seed_fingerprints")
@@ -0,0 +1,43 @@
+"""Add outbox messages
+
+Revision ID: 4e6b2c9a1f73
+Revises: 9d4f1a6c8e52
+Create Date: 2026-10-19 17:12:05.482931
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4e6b2c9a1f73"
+down_revision = "9d4f1a6c8e52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outbox_messages",
+        sa.Column("id", sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("event_type", sa.String(length=255), nullable=False),
+        sa.Column("payload", sa.dialects.postgresql.JSONB(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # Partial, so it only ever holds the backlog and stays small
+    op.create_index(
+        "ix_outbox_messages_pending",
+        "outbox_messages",
+        ["available_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_outbox_messages_pending", table_name="outbox_messages")
+    op.drop_table("outbox_messages")
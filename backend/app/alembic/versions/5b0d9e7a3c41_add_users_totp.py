@@ -0,0 +1,25 @@
+"""Add users two-factor authentication
+
+Revision ID: 5b0d9e7a3c41
+Revises: e91b7f3c6d28
+Create Date: 2026-10-19 15:03:12.508263
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b0d9e7a3c41"
+down_revision = "e91b7f3c6d28"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("totp_secret", sa.String(length=32), nullable=True))
+    op.add_column("users", sa.Column("totp_enabled", sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade():
+    op.drop_column("users", "totp_enabled")
+    op.drop_column("users", "totp_secret")
@@ -7,7 +7,6 @@ Create Date: 2025-08-30 11:19:43.195942
 """
 import sqlalchemy as sa
 from alembic import op
-from sqlalchemy.dialects.postgresql import UUID
 
 # revision identifiers, used by Alembic.
 revision = "764bda187091"
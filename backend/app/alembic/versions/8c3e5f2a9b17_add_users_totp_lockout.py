@@ -0,0 +1,25 @@
+"""Add users two-factor lockout
+
+Revision ID: 8c3e5f2a9b17
+Revises: 4e6b2c9a1f73
+Create Date: 2026-10-19 18:41:36.205117
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c3e5f2a9b17"
+down_revision = "4e6b2c9a1f73"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("totp_failed_attempts", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("users", sa.Column("totp_locked_until", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    op.drop_column("users", "totp_locked_until")
+    op.drop_column("users", "totp_failed_attempts")
@@ -0,0 +1,54 @@
+"""Add visitors
+
+Revision ID: 9d4f1a6c8e52
+Revises: 5b0d9e7a3c41
+Create Date: 2026-10-19 15:48:27.913604
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d4f1a6c8e52"
+down_revision = "5b0d9e7a3c41"
+branch_labels = None
+depends_on = None
+
+document_type = sa.Enum("ID_CARD", "FOREIGN_ID", "PASSPORT", "CITIZEN_CARD", name="documenttype")
+
+
+def upgrade():
+    # Trigram operator classes for the name typeahead
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        "visitors",
+        sa.Column("id", sa.dialects.postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("document_type", document_type, nullable=False),
+        sa.Column("document_number", sa.String(length=32), nullable=False),
+        sa.Column("full_name", sa.String(length=255), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_visitors_document", "visitors", ["document_type", "document_number"], unique=True)
+    op.create_index(
+        "ix_visitors_document_number_prefix",
+        "visitors",
+        ["document_number"],
+        postgresql_ops={"document_number": "text_pattern_ops"},
+    )
+    op.create_index(
+        "ix_visitors_full_name_trgm",
+        "visitors",
+        [sa.text("lower(full_name) gist_trgm_ops")],
+        postgresql_using="gist",
+    )
+
+
+def downgrade():
+    op.drop_index("ix_visitors_full_name_trgm", table_name="visitors")
+    op.drop_index("ix_visitors_document_number_prefix", table_name="visitors")
+    op.drop_index("ix_visitors_document", table_name="visitors")
+    op.drop_table("visitors")
+    document_type.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,47 @@
+"""Add role_id and lower(email) indexes
+
+Revision ID: a7c4e2f9d013
+Revises: 3f9a1c2d7b84
+Create Date: 2026-10-19 10:41:27.093518
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7c4e2f9d013"
+down_revision = "3f9a1c2d7b84"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Emails are stored and looked up in lower case from now on. This fails on
+    # ix_user_email if two existing users only differ by case, which must then
+    # be resolved by hand.
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and does not
+    # block writes to users while it builds
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_role_id",
+            "users",
+            ["role_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_users_email_lower",
+            "users",
+            [sa.text("lower(email)")],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_users_email_lower", table_name="users", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_users_role_id", table_name="users", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,53 @@
+"""Collate the visitors document number index in "C"
+
+Revision ID: b6d1f4e8a2c5
+Revises: 8c3e5f2a9b17
+Create Date: 2026-10-19 19:27:54.630418
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b6d1f4e8a2c5"
+down_revision = "8c3e5f2a9b17"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # text_pattern_ops serves the prefix range but not the ORDER BY of the
+    # default collation, every match had to be sorted. The new index is built
+    # before the old one is dropped, so the search is never left without one.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_visitors_document_number_c",
+            "visitors",
+            [sa.text('document_number COLLATE "C"')],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_visitors_document_number_prefix",
+            table_name="visitors",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_visitors_document_number_prefix",
+            "visitors",
+            ["document_number"],
+            postgresql_ops={"document_number": "text_pattern_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_visitors_document_number_c",
+            table_name="visitors",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
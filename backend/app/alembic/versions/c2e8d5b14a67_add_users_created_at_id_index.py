@@ -0,0 +1,31 @@
+"""Add users (created_at, id) index
+
+Revision ID: c2e8d5b14a67
+Revises: a7c4e2f9d013
+Create Date: 2026-10-19 13:05:51.742910
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c2e8d5b14a67"
+down_revision = "a7c4e2f9d013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Serves the keyset pagination of GET /users
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_created_at_id",
+            "users",
+            ["created_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_users_created_at_id", table_name="users", postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,34 @@
+"""Add users updated_at index
+
+Revision ID: d3a8f6c1e7b9
+Revises: b6d1f4e8a2c5
+Create Date: 2026-10-19 21:14:08.527361
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d3a8f6c1e7b9"
+down_revision = "b6d1f4e8a2c5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # count(*) and max(updated_at) of the users, the version of GET /users, in one
+    # index-only scan. It replaces the users row of catalog_versions, which every
+    # user write had to lock.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_updated_at",
+            "users",
+            ["updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    op.execute("DELETE FROM catalog_versions WHERE name = 'users'")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_users_updated_at", table_name="users", postgresql_concurrently=True, if_exists=True)
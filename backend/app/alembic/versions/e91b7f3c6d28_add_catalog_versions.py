@@ -0,0 +1,28 @@
+"""Add catalog versions
+
+Revision ID: e91b7f3c6d28
+Revises: c2e8d5b14a67
+Create Date: 2026-10-19 14:22:36.180447
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e91b7f3c6d28"
+down_revision = "c2e8d5b14a67"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalog_versions",
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("catalog_versions")
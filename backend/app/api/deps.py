@@ -1,33 +1,114 @@
-from typing import Generator, Annotated
+import uuid
+from collections.abc import AsyncGenerator
+from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, status
+from jose import JWTError
 from sqlmodel import Session
 
-from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import \
-    SQLAlchemyAggregateRootRepository
+from app.api.role.domain.role_models import ROLE_CATALOG, Role
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
 from app.api.user.application.auth_service import AuthService
+from app.api.user.domain.auth_models import TokenPayload
 from app.api.user.domain.user_models import User
-from app.core.db import engine
+from app.api.visitor.infrastructure.repository.sql.sql_alchemy_visitor_repository import (
+    SQLAlchemyVisitorRepository,
+)
+from app.core import security
+from app.core.db import get_engine
+from app.core.db_executor import run_in_session
 
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+async def get_db() -> AsyncGenerator[Session]:
+    """
+    Request-scoped session, created on the event loop.
+
+    A session only checks out a connection on its first query, which runs in the
+    database executor, and returns it after every read (see `run_in_session`).
+    Requests that never query cost no connection and no thread hop; closing goes
+    through the executor only when a connection has to be returned to the pool.
+    Objects are not expired on commit, they stay usable between jobs without
+    being reloaded on the event loop.
+    """
+    session = Session(get_engine(), expire_on_commit=False)
+    try:
         yield session
+    finally:
+        if session.in_transaction():
+            await run_in_session(session, session.close)
+        else:
+            session.close()
 
 
 SessionDep = Annotated[Session, Depends(get_db)]
 
 
-def get_user_aggregate_root_repository(session: SessionDep) -> SQLAlchemyAggregateRootRepository[User]:
+async def get_user_aggregate_root_repository(session: SessionDep) -> SQLAlchemyAggregateRootRepository[User]:
     return SQLAlchemyAggregateRootRepository[User](session, User)
 
 
 UserAggregateRootRepositoryDep = Depends(get_user_aggregate_root_repository)
 
-def get_auth_service(
+
+async def get_role_aggregate_root_repository(session: SessionDep) -> SQLAlchemyAggregateRootRepository[Role]:
+    return SQLAlchemyAggregateRootRepository[Role](session, Role, catalog=ROLE_CATALOG)
+
+
+RoleAggregateRootRepositoryDep = Depends(get_role_aggregate_root_repository)
+
+
+async def get_visitor_repository(session: SessionDep) -> SQLAlchemyVisitorRepository:
+    return SQLAlchemyVisitorRepository(session)
+
+
+VisitorRepositoryDep = Depends(get_visitor_repository)
+
+async def get_auth_service(
         user_repo: SQLAlchemyAggregateRootRepository[User] = UserAggregateRootRepositoryDep
 ) -> AuthService:
     return AuthService(user_repo)
 
 
 AuthServiceDep = Depends(get_auth_service)
+
+
+async def get_token_payload(request: Request) -> TokenPayload:
+    """
+    Validate the access token alone, without loading the user from the database.
+    """
+    token = security.extract_access_token(request)
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    try:
+        payload = TokenPayload.model_validate(security.decode_access_token(token))
+        uuid.UUID(payload.sub)
+    except (JWTError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    return payload
+
+
+TokenPayloadDep = Annotated[TokenPayload, Depends(get_token_payload)]
+
+
+async def get_current_user(token: TokenPayloadDep, session: SessionDep) -> User:
+    user = await run_in_session(session, session.get, User, uuid.UUID(token.sub))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+    return user
+
+
+CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+async def get_current_active_superuser(current_user: CurrentUser) -> User:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="The user doesn't have enough privileges")
+    return current_user
+
+
+CurrentSuperuser = Annotated[User, Depends(get_current_active_superuser)]
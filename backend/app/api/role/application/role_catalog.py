@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import NamedTuple
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from app.api.role.domain.role_models import ROLE_CATALOG, Role, RolePublic, RolesPublic
+from app.api.shared.infrastructure.http.etag import weak_etag
+from app.core.config import settings
+from app.core.db import get_engine, read_catalog_version
+
+
+class RoleCatalogSnapshot(NamedTuple):
+    """
+    Pre-serialized roles of a given catalog version, with their ETags.
+
+    :since: 0.0.1
+    """
+    version: int
+    body: bytes
+    etag: str
+    roles: dict[UUID, tuple[bytes, str]]
+
+
+def build_snapshot(version: int, roles: list[Role]) -> RoleCatalogSnapshot:
+    public = [RolePublic.model_validate(role) for role in roles]
+    body = RolesPublic(roles=public, count=len(public)).model_dump_json().encode()
+    by_id = {}
+    for role in public:
+        role_body = role.model_dump_json().encode()
+        by_id[role.id] = (role_body, weak_etag(role_body))
+    return RoleCatalogSnapshot(version, body, weak_etag(body), by_id)
+
+
+class RoleCatalog:
+    """
+    In-process snapshot of the roles, served without touching the database.
+
+    Every role write bumps a version counter stored in the database in the same
+    transaction. A worker trusts its snapshot for `refresh_interval` seconds, then
+    reads the counter once and only reloads the roles when it changed. The worker
+    that did the write is invalidated immediately; the others catch up within the
+    refresh interval.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, refresh_interval: float):
+        self.refresh_interval = refresh_interval
+        self._snapshot: RoleCatalogSnapshot | None = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> RoleCatalogSnapshot | None:
+        """
+        The snapshot, if it is still within its refresh interval.
+
+        :return: The snapshot, or None if `refresh` must be called first.
+        """
+        if time.monotonic() - self._checked_at < self.refresh_interval:
+            return self._snapshot
+        return None
+
+    def refresh(self) -> RoleCatalogSnapshot:
+        """
+        Check the catalog version and rebuild the snapshot if it changed.
+
+        This is a blocking method. Concurrent callers wait for a single check.
+
+        :return: The up-to-date snapshot.
+        """
+        with self._lock:
+            snapshot = self.current()
+            if snapshot is not None:
+                return snapshot
+
+            with Session(get_engine()) as session:
+                version = read_catalog_version(session, ROLE_CATALOG)
+                snapshot = self._snapshot
+                if snapshot is None or snapshot.version != version:
+                    roles = list(session.exec(select(Role).order_by(Role.name)).all())
+                    snapshot = build_snapshot(version, roles)
+
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+            return snapshot
+
+    def invalidate(self) -> None:
+        """
+        Force a version check on the next read, after a role write of this worker.
+        """
+        self._checked_at = 0.0
+
+
+role_catalog = RoleCatalog(settings.ROLE_CATALOG_REFRESH_SECONDS)
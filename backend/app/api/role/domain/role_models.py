@@ -8,17 +8,27 @@ if TYPE_CHECKING:
     from app.api.user.domain.user_models import User
 
 
+# Version counter of the roles, bumped on every write, see app.core.db.CatalogVersion
+ROLE_CATALOG = "roles"
+
+
 class RoleBase(SQLModel):
     name: str = Field(unique=True, index=True, max_length=255)
     description: str | None = Field(default=None, nullable=True)
 
 
+class RoleCreate(RoleBase):
+    pass
+
+
 class Role(RoleBase, table=True):
     __tablename__ = "roles"
 
     id: UUID = Field(default_factory=uuid4, nullable=False, primary_key=True)
 
-    users: list["User"] = Relationship(back_populates="role")
+    # Never unassigned by the ORM on delete: the foreign key rejects deleting a role
+    # that is still assigned
+    users: list["User"] = Relationship(back_populates="role", sa_relationship_kwargs={"passive_deletes": "all"})
 
 
 class RolePublic(RoleBase):
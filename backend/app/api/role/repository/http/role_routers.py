@@ -1,3 +1,85 @@
-from fastapi import APIRouter
+import uuid
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from sqlalchemy.exc import IntegrityError
+
+from app.api.deps import (
+    CurrentSuperuser,
+    RoleAggregateRootRepositoryDep,
+    TokenPayloadDep,
+    UserAggregateRootRepositoryDep,
+)
+from app.api.role.application.role_catalog import RoleCatalogSnapshot, role_catalog
+from app.api.role.domain.role_models import Role, RoleCreate, RolePublic, RolesPublic
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.api.shared.infrastructure.http.etag import conditional_response
+from app.api.user.domain.user_models import User
+from app.core.db_executor import get_db_executor, run_in_session
 
 router = APIRouter(prefix="/roles", tags=["Role"])
+
+
+async def get_role_catalog() -> RoleCatalogSnapshot:
+    # Steady-state reads are served from memory without leaving the event loop
+    snapshot = role_catalog.current()
+    if snapshot is None:
+        snapshot = await get_db_executor().run(role_catalog.refresh)
+    return snapshot
+
+
+@router.get("/", response_model=RolesPublic)
+async def read_roles(request: Request, _token: TokenPayloadDep):
+    snapshot = await get_role_catalog()
+    return conditional_response(request, snapshot.body, snapshot.etag)
+
+
+@router.get("/{role_id}", response_model=RolePublic)
+async def read_role(request: Request, role_id: uuid.UUID, _token: TokenPayloadDep):
+    snapshot = await get_role_catalog()
+    role = snapshot.roles.get(role_id)
+    if role is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+    body, etag = role
+    return conditional_response(request, body, etag)
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=RolePublic)
+async def create_role(
+        role_create: RoleCreate,
+        _current_user: CurrentSuperuser,
+        role_repo: SQLAlchemyAggregateRootRepository[Role] = RoleAggregateRootRepositoryDep
+):
+    role = Role.model_validate(role_create)
+
+    # The repository bumps the catalog version with the insert, only if it happens
+    if not await role_repo.insert_if_absent_async(role, "name"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Role already exists")
+
+    role_catalog.invalidate()
+    return role
+
+
+@router.delete("/{role_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_role(
+        role_id: uuid.UUID,
+        _current_user: CurrentSuperuser,
+        role_repo: SQLAlchemyAggregateRootRepository[Role] = RoleAggregateRootRepositoryDep,
+        user_repo: SQLAlchemyAggregateRootRepository[User] = UserAggregateRootRepositoryDep
+):
+    if await user_repo.exists_async(role_id=role_id):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Role is assigned to users")
+
+    # A user may still be assigned the role between the check and the delete,
+    # the foreign key then rejects the delete
+    try:
+        deleted = await role_repo.delete_async(id=role_id)
+    except IntegrityError:
+        await run_in_session(role_repo.session, role_repo.session.rollback)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Role is assigned to users")
+    if not deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+
+    role_catalog.invalidate()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,17 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Optional, Generic
+from collections.abc import Sequence
+from typing import Any
 
-# Type variable for the Aggregate Root type
-# This allows the repository to be generic over different Aggregate Root types.
-T = TypeVar("T")
+from app.api.shared.domain.domain_event import DomainEvent
 
 
-class AggregateRootRepository(ABC, Generic[T]):
+class AggregateRootRepository[T](ABC):
     """
     Abstract base class for all Aggregate Root repositories in the domain layer.
 
     This interface defines the essential synchronous CRUD operations for working
-    with Aggregate Roots in a Domain-Driven Design (DDD) context.
+    with Aggregate Roots in a Domain-Driven Design (DDD) context, generic over the
+    Aggregate Root type `T`.
 
     Concrete implementations should handle the persistence logic (e.g., SQL, NoSQL, in-memory).
 
@@ -37,7 +37,7 @@ class AggregateRootRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    def delete_and_retrieve_sync(self, **filters) -> Optional[T]:
+    def delete_and_retrieve_sync(self, **filters) -> T | None:
         """
         Remove an Aggregate Root from the repository and return the deleted instance.
 
@@ -55,7 +55,7 @@ class AggregateRootRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    def find_sync(self, **filters) -> Optional[T]:
+    def find_sync(self, **filters) -> T | None:
         """
         Retrieve an Aggregate Root by its unique identifier.
 
@@ -72,6 +72,27 @@ class AggregateRootRepository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def find_page_sync(
+            self,
+            order_by: Sequence[str],
+            limit: int,
+            after: Sequence[Any] | None = None,
+            fields: Sequence[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve one page of Aggregate Roots using keyset pagination.
+
+        :param order_by: The fields defining a unique, ascending order.
+        :param limit: The maximum number of Aggregate Roots to return.
+        :param after: The `order_by` values of the last Aggregate Root of the previous
+            page, or None for the first page.
+        :param fields: The fields to load; all of them when None. The `order_by`
+            fields are always loaded.
+        :return: The requested fields of each Aggregate Root in the page.
+        """
+        pass
+
     @abstractmethod
     def find_ids_sync(self) -> list[str]:
         """
@@ -82,12 +103,54 @@ class AggregateRootRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    def save_sync(self, aggregate_root: T) -> None:
+    def version_sync(self) -> str:
+        """
+        Retrieve a version of the whole repository, which changes whenever an
+        Aggregate Root is inserted, updated or deleted.
+
+        :return: An opaque version, only meant to be compared for equality.
+        """
+        pass
+
+    @abstractmethod
+    def insert_if_absent_sync(
+            self,
+            aggregate_root: T,
+            *conflict_fields: str,
+            events: Sequence[DomainEvent] = ()
+    ) -> bool:
+        """
+        Persist a new Aggregate Root unless one with the same unique values already exists.
+        The check and the insert must happen atomically.
+
+        :param aggregate_root: The Aggregate Root instance to persist.
+        :param conflict_fields: The fields of the unique constraint to check.
+        :param events: Domain events to record atomically with the insert, only if
+            it happens.
+        :return: True if the Aggregate Root was inserted, False if it already existed.
+        """
+        pass
+
+    @abstractmethod
+    def refresh_sync(self, aggregate_root: T, *attribute_names: str) -> None:
+        """
+        Load the given attributes of an Aggregate Root, e.g. its relationships, so
+        that reading them later does not hit the repository.
+
+        :param aggregate_root: The Aggregate Root instance to refresh.
+        :param attribute_names: The attributes to load; all of them when omitted.
+        :return: None
+        """
+        pass
+
+    @abstractmethod
+    def save_sync(self, aggregate_root: T, events: Sequence[DomainEvent] = ()) -> None:
         """
         Persist an Aggregate Root to the repository.
         If the Aggregate Root already exists, it should be updated.
 
         :param aggregate_root: The Aggregate Root instance to persist.
+        :param events: Domain events to record atomically with the Aggregate Root.
         :return: None
         """
         pass
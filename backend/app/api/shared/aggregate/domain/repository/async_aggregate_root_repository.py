@@ -1,10 +1,14 @@
-import asyncio
-from abc import ABC
-from typing import Optional, TypeVar
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
 
-from app.api.shared.aggregate.domain.repository.aggregate_root_repository import AggregateRootRepository
+from app.api.shared.aggregate.domain.repository.aggregate_root_repository import (
+    AggregateRootRepository,
+)
+from app.api.shared.domain.domain_event import DomainEvent
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
@@ -12,9 +16,10 @@ class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
     Asynchronous adapter for `AggregateRootRepository`.
 
     This class provides asynchronous wrappers for the synchronous methods
-    defined in `AggregateRootRepository`, executing them in a separate thread
-    using `asyncio.to_thread`. This allows synchronous repository implementations
-    to be safely called from asynchronous contexts without blocking the event loop.
+    defined in `AggregateRootRepository`, executing them through `_run`, which
+    implementations provide to run blocking calls off the event loop. This allows
+    synchronous repository implementations to be safely called from asynchronous
+    contexts without blocking the event loop.
 
     Subclasses should not override these methods unless providing a fully
     asynchronous implementation.
@@ -22,6 +27,15 @@ class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
     :since: 0.0.1
     """
 
+    @abstractmethod
+    async def _run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """
+        Run a synchronous method without blocking the event loop, e.g. in a
+        thread pool. Implementations bound to a session should also serialize
+        access to that session.
+        """
+        pass
+
     async def delete_async(self, **filters) -> bool:
         """
         Asynchronously delete an aggregate root by its unique identifier.
@@ -29,21 +43,21 @@ class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
         :param _id: The unique identifier of the aggregate root to delete.
         :return: True if the aggregate root was deleted successfully, False otherwise.
         """
-        return await asyncio.to_thread(self.delete_sync, **filters)
+        return await self._run(self.delete_sync, **filters)
 
     async def delete_all_async(self) -> None:
         """
         Asynchronously delete all aggregate roots from the repository.
         """
-        await asyncio.to_thread(self.delete_all_sync)
+        await self._run(self.delete_all_sync)
 
-    async def delete_and_retrieve_async(self, **filters) -> Optional[T]:
+    async def delete_and_retrieve_async(self, **filters) -> T | None:
         """
         Asynchronously delete an aggregate root and return the deleted instance.
 
         :return: The deleted aggregate root if found, None otherwise.
         """
-        return await asyncio.to_thread(self.delete_and_retrieve_sync, **filters)
+        return await self._run(self.delete_and_retrieve_sync, **filters)
 
     async def exists_async(self, **filters) -> bool:
         """
@@ -51,15 +65,15 @@ class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
 
         :return: True if the aggregate root exists, False otherwise.
         """
-        return await asyncio.to_thread(self.exists_sync, **filters)
+        return await self._run(self.exists_sync, **filters)
 
-    async def find_async(self, **filters) -> Optional[T]:
+    async def find_async(self, **filters) -> T | None:
         """
         Asynchronously retrieve an aggregate root by its unique identifier.
 
         :return: The aggregate root if found, None otherwise.
         """
-        return await asyncio.to_thread(self.find_sync, **filters)
+        return await self._run(self.find_sync, **filters)
 
     async def find_all_async(self) -> list[T]:
         """
@@ -67,7 +81,21 @@ class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
 
         :return: A list containing all aggregate roots in the repository.
         """
-        return await asyncio.to_thread(self.find_all_sync)
+        return await self._run(self.find_all_sync)
+
+    async def find_page_async(
+            self,
+            order_by: Sequence[str],
+            limit: int,
+            after: Sequence[Any] | None = None,
+            fields: Sequence[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Asynchronously retrieve one page of aggregate roots using keyset pagination.
+
+        :return: The requested fields of each aggregate root in the page.
+        """
+        return await self._run(self.find_page_sync, order_by, limit, after, fields)
 
     async def find_ids_async(self) -> list[str]:
         """
@@ -75,12 +103,46 @@ class AsyncAggregateRootRepository(AggregateRootRepository[T], ABC):
 
         :return: A list of aggregate root unique identifiers.
         """
-        return await asyncio.to_thread(self.find_ids_sync)
+        return await self._run(self.find_ids_sync)
+
+    async def version_async(self) -> str:
+        """
+        Asynchronously retrieve the version of the whole repository.
+
+        :return: An opaque version, only meant to be compared for equality.
+        """
+        return await self._run(self.version_sync)
+
+    async def insert_if_absent_async(
+            self,
+            aggregate_root: T,
+            *conflict_fields: str,
+            events: Sequence[DomainEvent] = ()
+    ) -> bool:
+        """
+        Asynchronously insert an aggregate root unless it already exists.
+
+        :param aggregate_root: The aggregate root instance to insert.
+        :param conflict_fields: The fields of the unique constraint to check.
+        :param events: Domain events to record with the insert.
+        :return: True if the aggregate root was inserted, False if it already existed.
+        """
+        return await self._run(self.insert_if_absent_sync, aggregate_root, *conflict_fields, events=events)
+
+    async def refresh_async(self, aggregate_root: T, *attribute_names: str) -> None:
+        """
+        Asynchronously load the given attributes of an aggregate root.
+
+        :param aggregate_root: The aggregate root instance to refresh.
+        :param attribute_names: The attributes to load; all of them when omitted.
+        """
+        await self._run(self.refresh_sync, aggregate_root, *attribute_names)
 
-    async def save_async(self, aggregate_root: T) -> None:
+    async def save_async(self, aggregate_root: T, events: Sequence[DomainEvent] = ()) -> None:
         """
         Asynchronously save an aggregate root.
 
         :param aggregate_root: The aggregate root instance to save.
+        :param events: Domain events to record with the aggregate root.
         """
-        await asyncio.to_thread(self.save_sync, aggregate_root)
+        await self._run(self.save_sync, aggregate_root, events)
@@ -1,10 +1,20 @@
-from typing import TypeVar, Optional, List, Type
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar
 
-from sqlmodel import Session, select, delete
+from sqlalchemy import func, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, delete, select
 
-from app.api.shared.aggregate.domain.repository.async_aggregate_root_repository import AsyncAggregateRootRepository
+from app.api.shared.aggregate.domain.repository.async_aggregate_root_repository import (
+    AsyncAggregateRootRepository,
+)
+from app.api.shared.domain.domain_event import DomainEvent
+from app.api.shared.infrastructure.outbox.outbox_models import OutboxMessage
+from app.core.db import bump_catalog_version
+from app.core.db_executor import run_in_session
 
 T = TypeVar("T")
+R = TypeVar("R")
 
 
 class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
@@ -25,11 +35,33 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
            from async event loops without running them in a separate thread or
            process.
          - For high concurrency, prefer the async methods.
+         - The async methods hold the session lock while they run, so a session
+           shared by concurrent coroutines is never used from two threads at once.
+
+     When a `catalog` name is given, every write that changes a row also bumps the
+     version of that catalog (see `app.core.db.CatalogVersion`) in the same
+     transaction, so readers can tell whether anything changed without a query
+     on the aggregate roots themselves.
      """
 
-    def __init__(self, session: Session, aggregate_root: Type[T]):
+    def __init__(self, session: Session, aggregate_root: type[T], catalog: str | None = None):
         self.session = session
         self.aggregate_root = aggregate_root
+        self.catalog = catalog
+
+    async def _run(self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        # On the database executor, one job at a time per session
+        return await run_in_session(self.session, fn, *args, **kwargs)
+
+    def _record_events(self, events: Sequence[DomainEvent]) -> None:
+        # Written by the next commit, in the same transaction as the aggregate root
+        for event in events:
+            self.session.add(OutboxMessage.from_event(event))
+
+    def _bump_catalog(self) -> None:
+        # Also written by the next commit
+        if self.catalog is not None:
+            bump_catalog_version(self.session, self.catalog)
 
     def delete_sync(self, **filters) -> bool:
         """
@@ -49,6 +81,7 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         obj = self.session.exec(statement).first()
         if obj:
             self.session.delete(obj)
+            self._bump_catalog()
             self.session.commit()
             return True
         return False
@@ -62,9 +95,10 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         """
         statement = delete(self.aggregate_root)
         self.session.execute(statement)
+        self._bump_catalog()
         self.session.commit()
 
-    def delete_and_retrieve_sync(self, **filters) -> Optional[T]:
+    def delete_and_retrieve_sync(self, **filters) -> T | None:
         """
         Delete an aggregate root and return it.
 
@@ -82,6 +116,7 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         obj = self.session.exec(statement).first()
         if obj:
             self.session.delete(obj)
+            self._bump_catalog()
             self.session.commit()
             return obj
         return None
@@ -97,7 +132,7 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         statement = select(self.aggregate_root).filter_by(**filters)
         return self.session.exec(statement).first() is not None
 
-    def find_sync(self, **filters) -> Optional[T]:
+    def find_sync(self, **filters) -> T | None:
         """
         Retrieve an aggregate root matching the filters.
 
@@ -108,7 +143,7 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         statement = select(self.aggregate_root).filter_by(**filters)
         return self.session.exec(statement).first()
 
-    def find_all_sync(self) -> List[T]:
+    def find_all_sync(self) -> list[T]:
         """
         Retrieve all aggregate roots.
 
@@ -121,7 +156,47 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         statement = select(self.aggregate_root)
         return list(self.session.exec(statement))
 
-    def find_ids_sync(self) -> List[str]:
+    def find_page_sync(
+            self,
+            order_by: Sequence[str],
+            limit: int,
+            after: Sequence[Any] | None = None,
+            fields: Sequence[str] | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Retrieve one page of aggregate roots, continuing after the given keys.
+
+        Example:
+            repo.find_page_sync(("created_at", "id"), 50)
+            repo.find_page_sync(("created_at", "id"), 50, after=(created_at, id), fields=("email",))
+
+        Args:
+            order_by: Columns defining a unique, ascending order.
+            limit: Maximum number of rows to return.
+            after: Values of `order_by` for the last row of the previous page.
+            fields: Columns to select, all of them when omitted. The `order_by`
+                columns are always selected.
+
+        Returns:
+            List[dict[str, Any]]: The selected columns of each row.
+
+        Note:
+            This is a blocking method. The page is found with a row-value comparison
+            (`(a, b) > (:a, :b)`) instead of an OFFSET, so an index on the
+            `order_by` columns serves every page in the same time.
+        """
+        table = self.aggregate_root.__table__
+        names = list(fields) if fields is not None else [column.name for column in table.columns]
+        names += [name for name in order_by if name not in names]
+
+        keys = [table.c[name] for name in order_by]
+        statement = select(*(table.c[name] for name in names)).order_by(*keys).limit(limit)
+        if after is not None:
+            statement = statement.where(tuple_(*keys) > tuple_(*after))
+
+        return [dict(row) for row in self.session.execute(statement).mappings()]
+
+    def find_ids_sync(self) -> list[str]:
         """
         Retrieve the IDs of all aggregate roots.
 
@@ -134,15 +209,99 @@ class SQLAlchemyAggregateRootRepository(AsyncAggregateRootRepository[T]):
         statement = select(self.aggregate_root.id)
         return [row[0] for row in self.session.exec(statement).all()]
 
-    def save_sync(self, aggregate_root: T) -> None:
+    def version_sync(self) -> str:
+        """
+        Retrieve the number of aggregate roots and the latest `updated_at` among
+        them, which together change with every insert, update and delete.
+
+        Returns:
+            str: The version, only meant to be compared for equality.
+
+        Note:
+            This is a blocking method. Unlike a counter bumped by every write, it
+            adds no row that concurrent writers would all have to lock. The aggregate
+            root needs an `updated_at` column, set on every update, ideally indexed
+            so that both aggregates come from one index-only scan.
+        """
+        table = self.aggregate_root.__table__
+        count, updated_at = self.session.execute(select(func.count(), func.max(table.c.updated_at))).one()
+        return f"{count}:{updated_at.isoformat() if updated_at else ''}"
+
+    def insert_if_absent_sync(
+            self,
+            aggregate_root: T,
+            *conflict_fields: str,
+            events: Sequence[DomainEvent] = ()
+    ) -> bool:
+        """
+        Insert an aggregate root in a single round trip, doing nothing if it
+        violates a unique constraint.
+
+        Example:
+            repo.insert_if_absent_sync(user, "email")
+
+        Args:
+            aggregate_root (T): The aggregate root to insert.
+            *conflict_fields: The columns of the unique constraint to check. When
+                omitted, a conflict on any unique constraint is ignored.
+            events: Domain events written to the outbox in the same transaction,
+                only if the aggregate root was inserted.
+
+        Returns:
+            bool: True if the aggregate root was inserted, False if it already existed.
+
+        Note:
+            This is a blocking method. It issues
+            `INSERT ... ON CONFLICT DO NOTHING RETURNING id`, so concurrent inserts of
+            the same values never reach the unique index as an error.
+        """
+        table = self.aggregate_root.__table__
+        dialect = self.session.get_bind().dialect.name
+        insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[dialect]
+
+        statement = (
+            insert(table)
+            .values({column.name: getattr(aggregate_root, column.name) for column in table.columns})
+            .on_conflict_do_nothing(index_elements=list(conflict_fields) or None)
+            .returning(table.c.id)
+        )
+        inserted = self.session.execute(statement).first()
+        if inserted is not None:
+            self._record_events(events)
+            self._bump_catalog()
+        self.session.commit()
+        return inserted is not None
+
+    def refresh_sync(self, aggregate_root: T, *attribute_names: str) -> None:
+        """
+        Load attributes of an aggregate root from the database.
+
+        Example:
+            repo.refresh_sync(user, "role")
+
+        Args:
+            aggregate_root (T): The aggregate root to refresh, attached to this session.
+            *attribute_names: The attributes to load. When omitted, every column
+                attribute is reloaded.
+
+        Note:
+            This is a blocking method. Loading a relationship here keeps the lazy
+            load out of the event loop thread.
+        """
+        self.session.refresh(aggregate_root, attribute_names=list(attribute_names) or None)
+
+    def save_sync(self, aggregate_root: T, events: Sequence[DomainEvent] = ()) -> None:
         """
         Save an aggregate root to the repository.
 
         Args:
             aggregate_root (T): The aggregate root to persist.
+            events: Domain events written to the outbox in the same transaction.
 
         Note:
             This is a blocking method.
         """
         self.session.add(aggregate_root)
+        self._record_events(events)
+        self._bump_catalog()
         self.session.commit()
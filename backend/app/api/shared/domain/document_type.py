@@ -13,4 +13,4 @@ class DocumentType(str, Enum):
     ID_CARD = "ID_Card"
     FOREIGN_ID = "Foreign_ID"
     PASSPORT = "Passport"
-    CITIZEN_CARD = "Citizen_Card"
\ No newline at end of file
+    CITIZEN_CARD = "Citizen_Card"
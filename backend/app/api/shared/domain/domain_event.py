@@ -0,0 +1,23 @@
+from typing import Any, ClassVar
+
+from pydantic import BaseModel
+
+
+class DomainEvent(BaseModel):
+    """
+    Something that happened to an aggregate root and that the outside world must
+    hear about, e.g. by email.
+
+    Events are saved to the outbox in the same transaction as the aggregate root
+    they come from, and delivered by the outbox dispatcher once committed.
+    Subclasses name themselves with `event_type` and carry JSON-serializable fields.
+
+    :since: 0.0.1
+    """
+    event_type: ClassVar[str]
+
+    def to_payload(self) -> dict[str, Any]:
+        """
+        :return: The fields of the event as stored in the outbox.
+        """
+        return self.model_dump(mode="json")
@@ -0,0 +1,55 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+
+def weak_etag(body: bytes) -> str:
+    """
+    Weak validator for a serialized representation.
+
+    :param body: The serialized response body.
+    :return: The ETag header value.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Weak comparison of `etag` against the `If-None-Match` header of the request.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def conditional_response(
+        request: Request,
+        body: bytes,
+        etag: str | None = None,
+        media_type: str = "application/json"
+) -> Response:
+    """
+    Serve a pre-serialized body with a weak ETag, or an empty 304 when the client
+    already holds the same representation.
+
+    :param etag: A precomputed `weak_etag(body)`, computed when omitted.
+    """
+    etag = etag or weak_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(content=body, media_type=media_type, headers=validator_headers(etag))
+
+
+def validator_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Empty 304 for a client that already holds the representation of `etag`.
+    """
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator_headers(etag))
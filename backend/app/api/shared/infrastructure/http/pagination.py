@@ -0,0 +1,36 @@
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import HTTPException, status
+from pydantic_core import to_jsonable_python
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the keyset of the last item of a page into an opaque cursor.
+
+    :param values: The values of the ordering fields of the last item.
+    :return: A URL-safe cursor string.
+    """
+    payload = json.dumps(to_jsonable_python(list(values)), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    :param cursor: The cursor received from the client.
+    :param size: The number of ordering fields the cursor must hold.
+    :return: The JSON values of the ordering fields.
+    :raises HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
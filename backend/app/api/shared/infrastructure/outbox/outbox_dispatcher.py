@@ -0,0 +1,181 @@
+import datetime
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from typing import Any
+
+from sqlalchemy import Engine, delete
+from sqlmodel import Session, col, select
+
+from app.api.shared.infrastructure.outbox.outbox_models import (
+    OUTBOX_DEAD,
+    OUTBOX_PENDING,
+    OUTBOX_SENT,
+    OutboxMessage,
+)
+from app.core.email import SMTPConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Builds the email announcing a domain event from its stored payload
+Notification = Callable[[dict[str, Any]], EmailMessage]
+
+
+def claim_batch(session: Session, limit: int, lease: datetime.timedelta) -> list[OutboxMessage]:
+    """
+    Lease the oldest due messages: count the attempt and push them back by `lease`,
+    in the current transaction.
+
+    Rows locked by another dispatcher are skipped rather than waited for. Once the
+    transaction commits, the leased messages are no longer due, so the other
+    dispatchers leave them alone until the lease runs out.
+    """
+    now = datetime.datetime.now(datetime.UTC)
+    statement = (
+        select(OutboxMessage)
+        .where(OutboxMessage.status == OUTBOX_PENDING, OutboxMessage.available_at <= now)
+        .order_by(OutboxMessage.available_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    messages = list(session.exec(statement))
+    for message in messages:
+        message.attempts += 1
+        message.available_at = now + lease
+    session.flush()
+    return messages
+
+
+class OutboxDispatcher:
+    """
+    Delivers the outbox messages as emails, in batches.
+
+    Each batch is leased in a short transaction, sent concurrently over a pool of
+    SMTP connections with no transaction open, and the outcomes are recorded in a
+    second one. A failed message is retried with exponential backoff, and given up
+    on (dead) after `max_attempts`.
+
+    Delivery is at least once: a dispatcher that dies between sending and recording,
+    or that outlives its `lease`, leaves messages that are sent again once the lease
+    runs out. The attempt is counted when the message is leased, so a message that
+    keeps bringing its dispatcher down still ends up dead.
+
+    :since: 0.0.1
+    """
+
+    def __init__(
+            self,
+            engine: Engine,
+            notifications: dict[str, Notification],
+            smtp_pool: SMTPConnectionPool,
+            batch_size: int,
+            max_attempts: int,
+            retry_base_seconds: float,
+            retention: datetime.timedelta,
+            lease: datetime.timedelta
+    ):
+        self.engine = engine
+        self.notifications = notifications
+        self.smtp_pool = smtp_pool
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retention = retention
+        self.lease = lease
+        self._executor = ThreadPoolExecutor(max_workers=smtp_pool.size, thread_name_prefix="outbox")
+
+    def deliver(self, event_type: str, payload: dict[str, Any]) -> str | None:
+        """
+        :return: None once sent, otherwise the reason it could not be.
+        """
+        notification = self.notifications.get(event_type)
+        if notification is None:
+            return f"No notification for {event_type}"
+        try:
+            self.smtp_pool.send(notification(payload))
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+        return None
+
+    def retry_delay(self, attempts: int) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.retry_base_seconds * 2 ** (attempts - 1))
+
+    def dispatch_batch(self) -> int:
+        """
+        Deliver one batch of due messages.
+
+        :return: How many messages were claimed.
+        """
+        with Session(self.engine, expire_on_commit=False) as session:
+            messages = claim_batch(session, self.batch_size, self.lease)
+            session.commit()
+        if not messages:
+            return 0
+
+        errors = list(self._executor.map(
+            self.deliver,
+            [message.event_type for message in messages],
+            [message.payload for message in messages],
+        ))
+
+        now = datetime.datetime.now(datetime.UTC)
+        with Session(self.engine) as session:
+            for message, error in zip(messages, errors, strict=True):
+                message = session.merge(message, load=False)
+                if error is None:
+                    message.status = OUTBOX_SENT
+                    message.sent_at = now
+                    message.last_error = None
+                    continue
+
+                message.last_error = error[:1000]
+                if message.attempts >= self.max_attempts:
+                    message.status = OUTBOX_DEAD
+                    logger.error("Giving up on outbox message %s after %d attempts: %s", message.id, message.attempts, error)
+                else:
+                    message.available_at = now + self.retry_delay(message.attempts)
+                    logger.warning("Outbox message %s failed, attempt %d: %s", message.id, message.attempts, error)
+            session.commit()
+
+        sent = errors.count(None)
+        logger.info("Dispatched %d outbox messages, %d failed", sent, len(messages) - sent)
+        return len(messages)
+
+    def purge_sent(self) -> int:
+        """
+        Delete the messages sent longer ago than the retention period.
+
+        :return: How many messages were deleted.
+        """
+        before = datetime.datetime.now(datetime.UTC) - self.retention
+        with Session(self.engine) as session:
+            result = session.exec(
+                delete(OutboxMessage)
+                .where(col(OutboxMessage.status) == OUTBOX_SENT, col(OutboxMessage.sent_at) < before)
+            )
+            session.commit()
+        return result.rowcount
+
+    def run(self, poll_interval: float, stop: threading.Event) -> None:
+        """
+        Dispatch until `stop` is set: batch after batch while messages are due,
+        polling every `poll_interval` seconds once the outbox is drained.
+        """
+        purged_at = None
+        while not stop.is_set():
+            try:
+                if self.dispatch_batch() == self.batch_size:
+                    continue
+                now = datetime.datetime.now(datetime.UTC)
+                if purged_at is None or now - purged_at > datetime.timedelta(hours=1):
+                    purged_at = now
+                    logger.info("Purged %d sent outbox messages", self.purge_sent())
+            except Exception:
+                logger.exception("Outbox dispatch failed")
+            stop.wait(poll_interval)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self.smtp_pool.close()
@@ -0,0 +1,56 @@
+import datetime
+import uuid
+from typing import Any
+
+from sqlalchemy import JSON, Column, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+from app.api.shared.domain.domain_event import DomainEvent
+
+OUTBOX_PENDING = "pending"
+OUTBOX_SENT = "sent"
+# Gave up after too many attempts
+OUTBOX_DEAD = "dead"
+
+
+class OutboxMessage(SQLModel, table=True):
+    """
+    Domain event waiting to be delivered, written in the transaction of the change
+    that raised it.
+
+    :since: 0.0.1
+    """
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        # The dispatcher only ever reads the pending messages that are due
+        Index(
+            "ix_outbox_messages_pending",
+            "available_at",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    event_type: str = Field(nullable=False, max_length=255)
+    payload: dict[str, Any] = Field(sa_column=Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False))
+
+    status: str = Field(default=OUTBOX_PENDING, nullable=False, max_length=16)
+    attempts: int = Field(default=0, nullable=False)
+    last_error: str | None = Field(default=None, nullable=True)
+
+    created_at: datetime.datetime = Field(
+        nullable=False,
+        default_factory=lambda: datetime.datetime.now(datetime.UTC)
+    )
+    # Not delivered before this time, pushed back after every failed attempt
+    available_at: datetime.datetime = Field(
+        nullable=False,
+        default_factory=lambda: datetime.datetime.now(datetime.UTC)
+    )
+    sent_at: datetime.datetime | None = Field(default=None, nullable=True)
+
+    @classmethod
+    def from_event(cls, event: DomainEvent) -> "OutboxMessage":
+        return cls(event_type=event.event_type, payload=event.to_payload())
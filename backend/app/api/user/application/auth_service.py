@@ -1,13 +1,26 @@
-from fastapi import Response, HTTPException, status
+import asyncio
+import datetime
+import logging
+import uuid
+
+from fastapi import HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
+from jose import JWTError
+from sqlalchemy import update
+from sqlmodel import Session
+from starlette.background import BackgroundTask
 from starlette.responses import JSONResponse
 
-from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import \
-    SQLAlchemyAggregateRootRepository
-from app.api.user.domain.auth_models import Token
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.api.user.domain.auth_models import Token, TwoFactorChallenge, TwoFactorLogin
 from app.api.user.domain.user_models import User
 from app.core import security
 from app.core.config import settings
+from app.core.db_executor import get_db_executor, run_in_session
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -25,7 +38,31 @@ class AuthService:
         return Token(access_token=access_token)
 
     async def get_user_by_email(self, email: str) -> User | None:
-        return await self.user_repo.find_async(email=email)
+        return await self.user_repo.find_async(email=email.lower())
+
+    async def rehash_password(self, user_id: uuid.UUID, hashed_password: str, password: str) -> None:
+        """
+        Re-hash a password with the configured cost after a successful login.
+
+        Runs as a background task once the response is sent, when the request
+        session is already closed, so it uses a session of its own on the same
+        database. The hash is only replaced if it did not change meanwhile.
+        """
+        new_hashed_password = await asyncio.to_thread(security.get_password_hash, password)
+        bind = self.user_repo.session.get_bind()
+
+        def save() -> None:
+            with Session(bind) as session:
+                user_repo = SQLAlchemyAggregateRootRepository[User](session, User)
+                user = user_repo.find_sync(id=user_id)
+                if user is not None and user.hashed_password == hashed_password:
+                    user.hashed_password = new_hashed_password
+                    user_repo.save_sync(user)
+
+        try:
+            await get_db_executor().run(save)
+        except Exception:
+            logger.exception("Could not rehash the password of user %s", user_id)
 
     async def authenticate_user(
             self,
@@ -38,10 +75,10 @@ class AuthService:
 
         # Avoid timing attacks by using a constant-time comparison
         if not user:
-            # If user is not found, we still call verify_password to mitigate timing attacks
-            security.verify_password(
-                form_password,
-                security.DUMMY_HASHED_PASSWORD
+            # If user is not found, we still call verify_password to mitigate timing attacks.
+            # Hashing is CPU-bound, it runs off the event loop like the real verification.
+            await asyncio.to_thread(
+                lambda: security.verify_password(form_password, security.get_dummy_hashed_password())
             )
 
             raise HTTPException(
@@ -50,7 +87,7 @@ class AuthService:
             )
 
         # Verify the password is correct
-        if not security.verify_password(form_password, user.hashed_password):
+        if not await asyncio.to_thread(security.verify_password, form_password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -63,12 +100,86 @@ class AuthService:
                 detail="Inactive user"
             )
 
+        # Roll out hash cost changes without a password reset
+        background = None
+        if security.password_needs_rehash(user.hashed_password):
+            background = BackgroundTask(self.rehash_password, user.id, user.hashed_password, form_password)
+
+        # With 2FA, the password step only earns a challenge for the OTP step
+        if user.totp_enabled:
+            challenge_token, _ = security.create_access_token(
+                subject=str(user.id),
+                aud=security.TWO_FACTOR_AUD,
+                ttl=security.timedelta(minutes=settings.TWO_FACTOR_CHALLENGE_EXPIRE_MINUTES)
+            )
+            return JSONResponse(
+                status_code=status.HTTP_200_OK,
+                content=TwoFactorChallenge(challenge_token=challenge_token).model_dump(),
+                background=background
+            )
+
+        return await self.login_response(user, background)
+
+    async def authenticate_two_factor(self, two_factor_login: TwoFactorLogin) -> JSONResponse:
+        """
+        Second step of a 2FA login: verify the OTP against the user of the challenge.
+
+        The password was checked when the challenge was issued, so no hashing
+        happens here, only a primary key lookup and the TOTP verification.
+        """
+        try:
+            payload = security.decode_access_token(two_factor_login.challenge_token, aud=security.TWO_FACTOR_AUD)
+            user_id = uuid.UUID(payload["sub"])
+        except (JWTError, KeyError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired challenge"
+            )
+
+        user = await self.user_repo.find_async(id=user_id)
+        if not user or not user.is_active or not user.totp_enabled or not user.totp_secret:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired challenge"
+            )
+
+        # Outlasts the challenge, so the challenges issued so far all expire locked
+        if is_locked(user.totp_locked_until):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many invalid authentication codes, try again later"
+            )
+
+        if (
+                not security.verify_2fa_token(user.totp_secret, two_factor_login.code)
+                or not security.totp_replay_cache.use(str(user.id), two_factor_login.code)
+        ):
+            await run_in_session(self.user_repo.session, record_failed_code, self.user_repo.session, user.id)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication code"
+            )
+
+        if user.totp_failed_attempts:
+            user.totp_failed_attempts = 0
+            await self.user_repo.save_async(user)
+
+        return await self.login_response(user)
+
+    async def login_response(self, user: User, background: BackgroundTask | None = None) -> JSONResponse:
+        """
+        Response of a completed login, setting the access token cookie.
+        """
+        # Load the role the token carries in the executor, not lazily on the event loop
+        await self.user_repo.refresh_async(user, "role")
+
         # Generate JWT token
         access_token = AuthService.issue_access_token(user)
 
         resp = JSONResponse(
             status_code=status.HTTP_200_OK,
-            content={"detail": "Login successful"}
+            content={"detail": "Login successful"},
+            background=background
         )
 
         resp.set_cookie(
@@ -81,4 +192,39 @@ class AuthService:
             expires=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
         )
 
-        return resp
\ No newline at end of file
+        return resp
+
+
+def is_locked(locked_until: datetime.datetime | None) -> bool:
+    if locked_until is None:
+        return False
+    if locked_until.tzinfo is None:
+        # Stored as UTC by databases without time zones
+        locked_until = locked_until.replace(tzinfo=datetime.UTC)
+    return locked_until > datetime.datetime.now(datetime.UTC)
+
+
+def record_failed_code(session: Session, user_id: uuid.UUID) -> None:
+    """
+    Count a wrong OTP of a user, locking the OTP step for `LOCKOUT_DURATION_MINUTES`
+    once there were `FAILED_LOGIN_ATTEMPTS` in a row.
+
+    The count is kept in the database and incremented atomically, so it holds
+    across challenges, workers and client addresses.
+    """
+    attempts = session.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(totp_failed_attempts=User.totp_failed_attempts + 1)
+        .returning(User.totp_failed_attempts)
+    ).scalar_one()
+    if attempts >= settings.FAILED_LOGIN_ATTEMPTS:
+        locked_until = datetime.datetime.now(datetime.UTC) + datetime.timedelta(
+            minutes=settings.LOCKOUT_DURATION_MINUTES
+        )
+        session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(totp_failed_attempts=0, totp_locked_until=locked_until)
+        )
+    session.commit()
@@ -0,0 +1,24 @@
+from email.message import EmailMessage
+from typing import Any
+
+from app.api.user.domain.user_events import UserRegistered
+from app.core.config import settings
+from app.core.email import build_email
+
+
+def welcome_email(payload: dict[str, Any]) -> EmailMessage:
+    event = UserRegistered.model_validate(payload)
+    return build_email(
+        to=event.email,
+        subject=f"Welcome to {settings.PROJECT_NAME}",
+        text=(
+            f"Your {settings.PROJECT_NAME} account for {event.email} has been created.\n\n"
+            f"Sign in at {settings.FRONTEND_URL}\n"
+        ),
+    )
+
+
+# Email sent for each domain event type, see app/dispatch_outbox.py
+NOTIFICATIONS = {
+    UserRegistered.event_type: welcome_email,
+}
@@ -1,4 +1,4 @@
-from sqlmodel import SQLModel
+from sqlmodel import Field, SQLModel
 
 
 # JSON payload containing access token
@@ -10,3 +10,23 @@ class Token(SQLModel):
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: str | None = None
+
+
+# Returned by the password step of a login when the user has 2FA enabled
+class TwoFactorChallenge(SQLModel):
+    detail: str = "Two-factor authentication required"
+    challenge_token: str
+
+
+class TwoFactorLogin(SQLModel):
+    challenge_token: str
+    code: str = Field(min_length=6, max_length=6)
+
+
+class TwoFactorCode(SQLModel):
+    code: str = Field(min_length=6, max_length=6)
+
+
+class TwoFactorSetup(SQLModel):
+    secret: str
+    uri: str
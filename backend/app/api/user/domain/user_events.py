@@ -0,0 +1,10 @@
+import uuid
+
+from app.api.shared.domain.domain_event import DomainEvent
+
+
+class UserRegistered(DomainEvent):
+    event_type = "user.registered"
+
+    user_id: uuid.UUID
+    email: str
@@ -2,7 +2,9 @@ import datetime
 import uuid
 from typing import TYPE_CHECKING, Optional
 
-from sqlmodel import SQLModel, Field, Relationship
+from pydantic import BaseModel, field_validator
+from sqlalchemy import Index, false, text
+from sqlmodel import Field, Relationship, SQLModel
 
 if TYPE_CHECKING:
     from app.api.role.domain.role_models import Role
@@ -11,22 +13,51 @@ if TYPE_CHECKING:
 class UserBase(SQLModel):
     email: str = Field(index=True, nullable=False, unique=True)
 
-    role_id: Optional[uuid.UUID] = Field(
+    role_id: uuid.UUID | None = Field(
         default=None,
         foreign_key="roles.id",
-        nullable=True
+        nullable=True,
+        index=True
     )
 
     is_active: bool = Field(default=True, nullable=False)
     is_superuser: bool = Field(default=False, nullable=False)
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        # Emails are case-insensitive, store and look them up in lower case
+        return email.lower()
+
 
 class UserCreate(UserBase):
     password: str = Field(min_length=8, max_length=40)
 
 
+class UserRegister(SQLModel):
+    """
+    Public self-registration. Only the credentials are taken: the privileges
+    (`is_superuser`, `role_id`) are left out, so they cannot be granted by the
+    caller and get their defaults.
+    """
+    email: str = Field(max_length=255)
+    password: str = Field(min_length=8, max_length=40)
+
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, email: str) -> str:
+        return email.lower()
+
+
 class User(UserBase, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+        # Keyset pagination of the user listing
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Version of the user listing, see SQLAlchemyAggregateRootRepository.version_sync
+        Index("ix_users_updated_at", "updated_at"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
 
@@ -34,16 +65,29 @@ class User(UserBase, table=True):
 
     hashed_password: str = Field(nullable=False)
 
+    # Two-factor authentication, enabled once the user confirmed a code of the secret
+    totp_secret: str | None = Field(default=None, nullable=True, max_length=32)
+    totp_enabled: bool = Field(default=False, nullable=False, sa_column_kwargs={"server_default": false()})
+    # Wrong codes in a row, the OTP step is locked for a while once there are too many
+    totp_failed_attempts: int = Field(default=0, nullable=False, sa_column_kwargs={"server_default": "0"})
+    totp_locked_until: datetime.datetime | None = Field(default=None, nullable=True)
+
     created_at: datetime.datetime = Field(
         nullable=False,
-        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc)
+        default_factory=lambda: datetime.datetime.now(datetime.UTC)
     )
     updated_at: datetime.datetime = Field(
         nullable=False,
-        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
-        sa_column_kwargs={"onupdate": datetime.datetime.now(datetime.timezone.utc)}
+        default_factory=lambda: datetime.datetime.now(datetime.UTC),
+        sa_column_kwargs={"onupdate": lambda: datetime.datetime.now(datetime.UTC)}
     )
 
 
 class UserPublic(UserBase):
     id: uuid.UUID
+
+
+class UsersPublic(BaseModel):
+    users: list[UserPublic]
+    count: int
+    next_cursor: str | None = None
@@ -1,39 +1,44 @@
+import asyncio
 from typing import Annotated
 
-import jwt
-from fastapi import APIRouter, Header, Response, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.api.deps import AuthServiceDep, UserAggregateRootRepositoryDep
-from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import \
-    SQLAlchemyAggregateRootRepository
+from app.api.deps import AuthServiceDep, CurrentUser, UserAggregateRootRepositoryDep
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
 from app.api.user.application.auth_service import AuthService
-from app.api.user.domain.user_models import UserCreate, User
+from app.api.user.domain.auth_models import (
+    TwoFactorCode,
+    TwoFactorLogin,
+    TwoFactorSetup,
+)
+from app.api.user.domain.user_events import UserRegistered
+from app.api.user.domain.user_models import User, UserRegister
 from app.core import security
-from app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
 @router.post("/register", status_code=201)
 async def register(
-        user_create: UserCreate,
+        user_register: UserRegister,
         user_repo: SQLAlchemyAggregateRootRepository[User] = UserAggregateRootRepositoryDep
 ):
-    # Check if the user already exists
-    existing_user = await user_repo.find_async(email=user_create.email)
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User already exists")
+    # Hash off the event loop, bcrypt would otherwise block every other request
+    hashed_password = await asyncio.to_thread(security.get_password_hash, user_register.password)
 
-    hashed_password = security.get_password_hash(user_create.password)
+    user = User(email=user_register.email, hashed_password=hashed_password)
 
-    # Save the new user
-    user = User.model_validate(
-        user_create,
-        update={"hashed_password": hashed_password}
-    )
+    # Existence check and insert in one statement, so concurrent registrations
+    # of the same email cannot race past a separate lookup. No conflict target:
+    # both the email and the lower(email) unique indexes count as a duplicate.
+    # The registration is recorded in the outbox, committed with the user; the
+    # dispatcher sends the welcome email once emails are configured.
+    if not await user_repo.insert_if_absent_async(user, events=[UserRegistered(user_id=user.id, email=user.email)]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="User already exists")
 
-    await user_repo.save_async(user)
     return {"message": "User registered successfully"}
 
 
@@ -46,6 +51,54 @@ async def login(
     return await auth_service.authenticate_user(response, form_data)
 
 
+@router.post("/login/2fa")
+async def login_two_factor(
+        two_factor_login: TwoFactorLogin,
+        auth_service: AuthService = AuthServiceDep
+):
+    return await auth_service.authenticate_two_factor(two_factor_login)
+
+
+@router.post("/2fa/setup", response_model=TwoFactorSetup)
+async def setup_two_factor(
+        current_user: CurrentUser,
+        user_repo: SQLAlchemyAggregateRootRepository[User] = UserAggregateRootRepositoryDep
+):
+    if current_user.totp_enabled:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Two-factor authentication already enabled")
+
+    # Not enabled until a code of the new secret is confirmed
+    current_user.totp_secret = security.generate_2fa_secret_key()
+    await user_repo.save_async(current_user)
+
+    return TwoFactorSetup(
+        secret=current_user.totp_secret,
+        uri=security.get_totp_uri(current_user.totp_secret, current_user.email)
+    )
+
+
+@router.post("/2fa/enable", status_code=204)
+async def enable_two_factor(
+        two_factor_code: TwoFactorCode,
+        current_user: CurrentUser,
+        user_repo: SQLAlchemyAggregateRootRepository[User] = UserAggregateRootRepositoryDep
+):
+    if current_user.totp_enabled:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Two-factor authentication already enabled")
+    if not current_user.totp_secret:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Two-factor authentication not set up")
+
+    if (
+            not security.verify_2fa_token(current_user.totp_secret, two_factor_code.code)
+            or not security.totp_replay_cache.use(str(current_user.id), two_factor_code.code)
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid authentication code")
+
+    current_user.totp_enabled = True
+    await user_repo.save_async(current_user)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.post("/logout", status_code=204)
 async def logout(response: Response):
     response.delete_cookie(key="access_token")
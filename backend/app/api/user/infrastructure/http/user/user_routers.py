@@ -1,3 +1,75 @@
-from fastapi import APIRouter
+import datetime
+import uuid
 
-router = APIRouter(prefix="/users", tags=["User"])
\ No newline at end of file
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from pydantic_core import to_json
+
+from app.api.deps import CurrentSuperuser, CurrentUser, UserAggregateRootRepositoryDep
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.api.shared.infrastructure.http.etag import (
+    conditional_response,
+    etag_matches,
+    not_modified,
+    weak_etag,
+)
+from app.api.shared.infrastructure.http.pagination import decode_cursor, encode_cursor
+from app.api.user.domain.user_models import User, UserPublic, UsersPublic
+
+router = APIRouter(prefix="/users", tags=["User"])
+
+USER_FIELDS = tuple(UserPublic.model_fields)
+PAGE_ORDER = ("created_at", "id")
+
+
+@router.get("/", response_model=UsersPublic)
+async def read_users(
+        request: Request,
+        _current_user: CurrentSuperuser,
+        limit: int = Query(default=50, ge=1, le=200),
+        cursor: str | None = Query(default=None, description="The next_cursor of the previous page"),
+        fields: str | None = Query(default=None, description="Comma-separated subset of the user fields to return"),
+        user_repo: SQLAlchemyAggregateRootRepository[User] = UserAggregateRootRepositoryDep
+):
+    selected = list(USER_FIELDS)
+    if fields:
+        selected = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [field for field in selected if field not in USER_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    after = None
+    if cursor:
+        created_at, user_id = decode_cursor(cursor, len(PAGE_ORDER))
+        try:
+            after = (datetime.datetime.fromisoformat(created_at), uuid.UUID(user_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    # The version changes with every user write: when it did not change since the
+    # client got this page, answer from the version alone, without the page query.
+    # Read before the page, so a write in between only makes the ETag too old.
+    version = await user_repo.version_async()
+    etag = weak_etag(f"{version}:{limit}:{cursor}:{','.join(selected)}".encode())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # One extra row tells whether there is a next page
+    rows = await user_repo.find_page_async(PAGE_ORDER, limit + 1, after, selected)
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][key] for key in PAGE_ORDER])
+
+    users = [{field: row[field] for field in selected} for row in rows]
+    body = to_json({"users": users, "count": len(users), "next_cursor": next_cursor})
+
+    # Serialized by hand: with `fields` the users are partial UserPublic objects
+    return conditional_response(request, body, etag)
+
+
+@router.get("/me", response_model=UserPublic)
+async def read_user_me(current_user: CurrentUser):
+    return current_user
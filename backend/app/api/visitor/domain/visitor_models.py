@@ -0,0 +1,84 @@
+import datetime
+import re
+import uuid
+
+from pydantic import BaseModel, field_validator
+from sqlalchemy import Index, func
+from sqlmodel import Field, SQLModel
+
+from app.api.shared.domain.document_type import DocumentType
+
+
+def normalize_document_number(document_number: str) -> str:
+    """
+    Keep only the letters and digits of a document number, in upper case, so that
+    "1.234.567-8" and "12345678" are the same document.
+    """
+    return re.sub(r"[^0-9A-Za-z]", "", document_number).upper()
+
+
+class VisitorBase(SQLModel):
+    document_type: DocumentType = Field(nullable=False)
+    document_number: str = Field(nullable=False, min_length=1, max_length=32)
+    full_name: str = Field(nullable=False, min_length=1, max_length=255)
+
+    @field_validator("document_number")
+    @classmethod
+    def normalize_document_number(cls, document_number: str) -> str:
+        return normalize_document_number(document_number)
+
+    @field_validator("full_name")
+    @classmethod
+    def normalize_full_name(cls, full_name: str) -> str:
+        return " ".join(full_name.split())
+
+
+class VisitorCreate(VisitorBase):
+    pass
+
+
+class Visitor(VisitorBase, table=True):
+    __tablename__ = "visitors"
+    __table_args__ = (
+        # A visitor is identified by their document
+        Index("ix_visitors_document", "document_type", "document_number", unique=True),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+
+    created_at: datetime.datetime = Field(
+        nullable=False,
+        default_factory=lambda: datetime.datetime.now(datetime.UTC)
+    )
+    updated_at: datetime.datetime = Field(
+        nullable=False,
+        default_factory=lambda: datetime.datetime.now(datetime.UTC),
+        sa_column_kwargs={"onupdate": lambda: datetime.datetime.now(datetime.UTC)}
+    )
+
+
+# Typeahead of document numbers by prefix. In the "C" collation, byte order, the
+# index serves both the prefix range and the ORDER BY, so the scan stops at the
+# LIMIT instead of sorting every match. Only Postgres has the collation.
+Index(
+    "ix_visitors_document_number_c",
+    Visitor.document_number.collate("C"),
+).ddl_if(dialect="postgresql")
+
+# Typeahead of names by trigram similarity. Declared once the column exists, the
+# operator class of an expression can only be given through a label.
+Index(
+    "ix_visitors_full_name_trgm",
+    func.lower(Visitor.full_name).label("full_name_lower"),
+    postgresql_using="gist",
+    postgresql_ops={"full_name_lower": "gist_trgm_ops"},
+)
+
+
+class VisitorPublic(VisitorBase):
+    id: uuid.UUID
+
+
+class VisitorsPublic(BaseModel):
+    visitors: list[VisitorPublic]
+    count: int
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.api.deps import CurrentUser, TokenPayloadDep, VisitorRepositoryDep
+from app.api.shared.domain.document_type import DocumentType
+from app.api.visitor.domain.visitor_models import (
+    Visitor,
+    VisitorCreate,
+    VisitorPublic,
+    VisitorsPublic,
+    normalize_document_number,
+)
+from app.api.visitor.infrastructure.repository.sql.sql_alchemy_visitor_repository import (
+    SQLAlchemyVisitorRepository,
+)
+
+router = APIRouter(prefix="/visitors", tags=["Visitor"])
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=VisitorPublic)
+async def create_visitor(
+        visitor_create: VisitorCreate,
+        _current_user: CurrentUser,
+        visitor_repo: SQLAlchemyVisitorRepository = VisitorRepositoryDep
+):
+    visitor = Visitor.model_validate(visitor_create)
+    if not await visitor_repo.insert_if_absent_async(visitor, "document_type", "document_number"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Visitor already exists")
+    return visitor
+
+
+# Called on every keystroke: only the token is checked, the user is not loaded
+@router.get("/search", response_model=VisitorsPublic)
+async def search_visitors(
+        _token: TokenPayloadDep,
+        q: str = Query(min_length=2, max_length=255, description="Document number prefix or part of a name"),
+        limit: int = Query(default=10, ge=1, le=50),
+        visitor_repo: SQLAlchemyVisitorRepository = VisitorRepositoryDep
+):
+    visitors = await visitor_repo.search_async(q, limit)
+    return VisitorsPublic(
+        visitors=[VisitorPublic.model_validate(visitor) for visitor in visitors],
+        count=len(visitors)
+    )
+
+
+@router.get("/{document_type}/{document_number}", response_model=VisitorPublic)
+async def read_visitor(
+        document_type: DocumentType,
+        document_number: str,
+        _token: TokenPayloadDep,
+        visitor_repo: SQLAlchemyVisitorRepository = VisitorRepositoryDep
+):
+    visitor = await visitor_repo.find_async(
+        document_type=document_type,
+        document_number=normalize_document_number(document_number)
+    )
+    if not visitor:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Visitor not found")
+    return visitor
@@ -0,0 +1,78 @@
+
+from sqlalchemy import func, literal
+from sqlmodel import Session, select
+
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.api.visitor.domain.visitor_models import Visitor, normalize_document_number
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SQLAlchemyVisitorRepository(SQLAlchemyAggregateRootRepository[Visitor]):
+    """
+    Visitor repository adding the typeahead search of the reception desk.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, session: Session):
+        super().__init__(session, Visitor)
+
+    def search_sync(self, query: str, limit: int) -> list[Visitor]:
+        """
+        Find the visitors best matching what has been typed so far.
+
+        Example:
+            repo.search_sync("1023", 10)
+            repo.search_sync("maria gom", 10)
+
+        Args:
+            query: A document number prefix when it contains a digit, otherwise
+                part of a name.
+            limit: Maximum number of visitors to return.
+
+        Returns:
+            List[Visitor]: Matching visitors, best matches first.
+
+        Note:
+            This is a blocking method. Both searches read the top matches straight
+            from an index instead of sorting every match:
+                - document numbers use a prefix range scan on
+                  `ix_visitors_document_number_c`, compared and ordered in its
+                  "C" collation, so the rows come out of the index in order;
+                - names are filtered by substring and ordered by trigram word
+                  distance with a nearest-neighbour scan of the GiST index
+                  `ix_visitors_full_name_trgm`.
+            Other databases than Postgres get a plain LIKE search.
+        """
+        postgres = self.session.get_bind().dialect.name == "postgresql"
+        if any(character.isdigit() for character in query):
+            prefix = escape_like(normalize_document_number(query))
+            document_number = Visitor.document_number.collate("C") if postgres else Visitor.document_number
+            statement = (
+                select(Visitor)
+                .where(document_number.like(f"{prefix}%", escape="\\"))
+                .order_by(document_number)
+                .limit(limit)
+            )
+            return list(self.session.exec(statement))
+
+        name = " ".join(query.lower().split())
+        full_name = func.lower(Visitor.full_name)
+        statement = select(Visitor).where(full_name.like(f"%{escape_like(name)}%", escape="\\")).limit(limit)
+        if postgres:
+            # The distance alone, so the index scan returns rows already in order
+            statement = statement.order_by(literal(name).op("<<->")(full_name))
+        else:
+            statement = statement.order_by(full_name, Visitor.id)
+        return list(self.session.exec(statement))
+
+    async def search_async(self, query: str, limit: int) -> list[Visitor]:
+        """
+        Asynchronously find the visitors best matching a typeahead query.
+        """
+        return await self._run(self.search_sync, query, limit)
@@ -0,0 +1,218 @@
+import json
+import logging
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from pydantic import BaseModel
+from sqlalchemy import Engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, create_engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Fixed pure Python workload timed with a suite, its speed is the speed of the machine
+CALIBRATION = "harness.calibration"
+
+# Consecutive batches the samples are split in to measure the noise of a run
+NOISE_BATCHES = 5
+
+
+class BenchmarkResult(BaseModel):
+    """
+    Timing statistics of a single benchmark, in seconds per operation.
+
+    :since: 0.0.1
+    """
+    name: str
+    rounds: int
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stdev: float
+    # Relative spread of the batch minimums, how far the minimum moves within the run
+    noise: float = 0.0
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1 / self.median if self.median else float("inf")
+
+
+class BenchmarkReport(BaseModel):
+    """
+    Machine-readable output of a benchmark run.
+
+    :since: 0.0.1
+    """
+    suite: str
+    database_url: str | None = None
+    results: list[BenchmarkResult]
+
+    def by_name(self) -> dict[str, BenchmarkResult]:
+        return {result.name: result for result in self.results}
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an unsorted list of samples.
+    """
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def noise(samples: list[float], batches: int = NOISE_BATCHES) -> float:
+    """
+    Relative spread between the minimums of consecutive batches of samples, e.g.
+    0.2 when the slowest batch minimum is 20% above the fastest.
+    """
+    size = len(samples) // batches
+    if size < 1:
+        return 0.0
+    minimums = [min(samples[i * size:(i + 1) * size]) for i in range(batches)]
+    return max(minimums) / min(minimums) - 1 if min(minimums) else 0.0
+
+
+def summarize(name: str, samples: list[float]) -> BenchmarkResult:
+    return BenchmarkResult(
+        name=name,
+        rounds=len(samples),
+        min=min(samples),
+        median=statistics.median(samples),
+        mean=statistics.fmean(samples),
+        p95=percentile(samples, 0.95),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        noise=noise(samples),
+    )
+
+
+def run_benchmark(name: str, fn: Callable[[], object], rounds: int, warmup: int = 3) -> BenchmarkResult:
+    """
+    Time `fn` individually for the given number of rounds after a warmup.
+
+    :param name: The name the result is reported and compared under.
+    :param fn: A zero-argument callable performing one operation.
+    :param rounds: How many timed calls to perform.
+    :param warmup: How many untimed calls to perform first.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e9)
+
+    result = summarize(name, samples)
+    logger.info(
+        "%-40s median %10.3f us  p95 %10.3f us  %10.1f ops/s  noise %5.1f%%",
+        name, result.median * 1e6, result.p95 * 1e6, result.ops_per_sec, result.noise * 100
+    )
+    return result
+
+
+def calibrate(rounds: int) -> BenchmarkResult:
+    """
+    Time the calibration workload: the allocations, dict lookups and string
+    formatting the hot paths are made of, and nothing that the code under test
+    can change.
+    """
+
+    def workload() -> None:
+        values = {f"key-{i}": i for i in range(200)}
+        sum(values[f"key-{i}"] for i in range(200))
+
+    return run_benchmark(CALIBRATION, workload, rounds)
+
+
+def compare_to_baseline(report: BenchmarkReport, baseline: BenchmarkReport, threshold: float) -> list[str]:
+    """
+    Compare the fastest timings against a stored baseline.
+
+    The same code on the same machine varies far more between runs than a 10%
+    threshold, so the comparison is made noise-aware three ways:
+    - the minimum is compared rather than the median, since background load only
+      ever makes a round slower;
+    - when both reports timed the calibration workload, the baseline is scaled
+      by how much faster or slower the machine ran it, so a baseline recorded on
+      another machine or under other load still applies;
+    - the allowed slowdown is the threshold plus the noise of the noisier of the
+      two runs.
+
+    :param threshold: Allowed relative slowdown on top of the noise, e.g. 0.1 for 10%.
+    :return: A description of every benchmark slower than the threshold allows.
+    """
+    regressions = []
+    previous = baseline.by_name()
+    current = report.by_name()
+    scale = 1.0
+    if CALIBRATION in current and CALIBRATION in previous:
+        scale = current[CALIBRATION].min / previous[CALIBRATION].min
+        logger.info("%-40s %7.2fx the baseline machine time", CALIBRATION, scale)
+
+    for result in report.results:
+        reference = previous.get(result.name)
+        if result.name == CALIBRATION:
+            continue
+        if reference is None:
+            logger.info("%s has no baseline, skipping comparison", result.name)
+            continue
+
+        expected = reference.min * scale
+        change = result.min / expected - 1
+        allowed = threshold + max(result.noise, reference.noise)
+        logger.info("%-40s %+7.1f%% vs baseline, allowed %+7.1f%%", result.name, change * 100, allowed * 100)
+        if change > allowed:
+            regressions.append(
+                f"{result.name}: min {result.min * 1e6:.3f} us is {change:.1%} slower than the "
+                f"baseline {expected * 1e6:.3f} us on this machine (allowed {allowed:.1%}, "
+                f"threshold {threshold:.0%} plus noise)"
+            )
+    return regressions
+
+
+def load_report(path: Path) -> BenchmarkReport | None:
+    if not path.exists():
+        return None
+    return BenchmarkReport.model_validate(json.loads(path.read_text()))
+
+
+def save_report(report: BenchmarkReport, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(report.model_dump_json(indent=2) + "\n")
+
+
+def create_benchmark_engine(database_url: str) -> Engine:
+    """
+    Create an engine for a local Postgres or an in-memory SQLite stand-in and make
+    sure the tables exist.
+
+    An in-memory SQLite database lives in a single shared connection so it can be
+    used from the worker threads of the async repositories. That connection must
+    not be used concurrently, so concurrent callers should use a file database.
+    """
+    # Register every model on the metadata before creating the tables
+    from app.api.role.domain.role_models import Role  # noqa
+    from app.api.shared.infrastructure.outbox.outbox_models import OutboxMessage  # noqa
+    from app.api.user.domain.user_models import User  # noqa
+    from app.api.visitor.domain.visitor_models import Visitor  # noqa
+    from app.core.db import CatalogVersion  # noqa
+
+    if database_url in ("sqlite://", "sqlite:///:memory:"):
+        engine = create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    elif database_url.startswith("sqlite"):
+        engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(database_url)
+
+    SQLModel.metadata.create_all(engine)
+    return engine
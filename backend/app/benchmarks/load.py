@@ -0,0 +1,371 @@
+"""
+End-to-end load scenarios with SLO reports.
+
+Drives the ASGI app in-process through httpx, optionally against a stand-in
+database (use a file, requests run concurrently):
+
+    python -m app.benchmarks.load --database-url sqlite:///./load.db --concurrency 32 --requests 500
+
+or a running server:
+
+    python -m app.benchmarks.load --base-url http://localhost:8000
+
+Every scenario reports throughput, latency percentiles and the error rate, and
+is checked against its SLO. Override the default SLOs with `--slo-file`, a JSON
+object mapping scenario names to `{"p99_ms": ..., "max_error_rate": ..., "min_rps": ...}`.
+The process exits with status 1 when any SLO is violated.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from collections.abc import AsyncGenerator
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import httpx
+from pydantic import BaseModel
+from sqlmodel import Session, delete
+
+from app.api.deps import get_db
+from app.api.user.domain.user_models import User
+from app.benchmarks.harness import create_benchmark_engine, percentile
+from app.core.config import settings
+from app.core.db_executor import DatabaseExecutorStats, get_db_executor
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+LOAD_EMAIL_DOMAIN = "load.qr-access.invalid"
+LOAD_PASSWORD = "load-test-password"
+
+
+class Slo(BaseModel):
+    """
+    Service level objective of a scenario.
+
+    :since: 0.0.1
+    """
+    p99_ms: float
+    max_error_rate: float = 0.01
+    min_rps: float = 0.0
+
+
+DEFAULT_SLOS: dict[str, Slo] = {
+    "register_storm": Slo(p99_ms=2000),
+    "duplicate_register": Slo(p99_ms=2000, max_error_rate=0.0),
+    "login_burst": Slo(p99_ms=2000),
+    "authenticated_reads": Slo(p99_ms=100, min_rps=200),
+}
+
+
+class ScenarioReport(BaseModel):
+    """
+    Outcome of a scenario run. Latencies are in milliseconds.
+
+    :since: 0.0.1
+    """
+    scenario: str
+    requests: int
+    concurrency: int
+    duration_s: float
+    throughput_rps: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    error_rate: float
+    statuses: dict[str, int]
+    slo: Slo
+    violations: list[str]
+    # Only measured when the app runs in-process
+    db_executor: DatabaseExecutorStats | None = None
+
+
+class ScenarioRequest(NamedTuple):
+    method: str
+    url: str
+    kwargs: dict[str, Any]
+    expected_statuses: tuple[int, ...]
+
+
+class Scenario:
+    """
+    A named stream of requests. `setup` runs once before the timed part.
+    """
+    name: str
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        pass
+
+    def request(self, index: int) -> ScenarioRequest:
+        raise NotImplementedError
+
+    def check(self, statuses: Counter[str]) -> list[str]:
+        """
+        Scenario-specific correctness checks on the response statuses.
+
+        :return: A description of every violated expectation.
+        """
+        return []
+
+    def email(self, suffix: object) -> str:
+        return f"{self.name}-{self.run_id}-{suffix}@{LOAD_EMAIL_DOMAIN}"
+
+    async def register(self, client: httpx.AsyncClient, email: str) -> None:
+        response = await client.post(
+            f"{settings.API_V1_STR}/auth/register",
+            json={"email": email, "password": LOAD_PASSWORD},
+        )
+        if response.status_code != 201:
+            raise RuntimeError(f"Could not register {email}: {response.status_code} {response.text}")
+
+    async def login(self, client: httpx.AsyncClient, email: str) -> str:
+        response = await client.post(
+            f"{settings.API_V1_STR}/auth/login",
+            data={"username": email, "password": LOAD_PASSWORD},
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"Could not log in {email}: {response.status_code} {response.text}")
+        return response.cookies["access_token"]
+
+
+class RegisterStorm(Scenario):
+    """Every request registers a new user."""
+    name = "register_storm"
+
+    def request(self, index: int) -> ScenarioRequest:
+        return ScenarioRequest(
+            "POST",
+            f"{settings.API_V1_STR}/auth/register",
+            {"json": {"email": self.email(index), "password": LOAD_PASSWORD}},
+            (201,),
+        )
+
+
+class DuplicateRegister(Scenario):
+    """
+    Every request registers the same email concurrently: exactly one must succeed
+    and all the others must be rejected with a 400, never a 500.
+    """
+    name = "duplicate_register"
+
+    def request(self, index: int) -> ScenarioRequest:
+        return ScenarioRequest(
+            "POST",
+            f"{settings.API_V1_STR}/auth/register",
+            {"json": {"email": self.email("duplicate"), "password": LOAD_PASSWORD}},
+            (201, 400),
+        )
+
+    def check(self, statuses: Counter[str]) -> list[str]:
+        if statuses["201"] != 1:
+            return [f"{statuses['201']} registrations succeeded instead of exactly 1"]
+        return []
+
+
+class LoginBurst(Scenario):
+    """Logins against a pool of users, a configurable share of them with a wrong password."""
+    name = "login_burst"
+    users = 10
+
+    def __init__(self, run_id: str, invalid_ratio: float):
+        super().__init__(run_id)
+        self.invalid_ratio = invalid_ratio
+        self.random = random.Random(run_id)
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        for i in range(self.users):
+            await self.register(client, self.email(i))
+
+    def request(self, index: int) -> ScenarioRequest:
+        valid = self.random.random() >= self.invalid_ratio
+        return ScenarioRequest(
+            "POST",
+            f"{settings.API_V1_STR}/auth/login",
+            {"data": {
+                "username": self.email(index % self.users),
+                "password": LOAD_PASSWORD if valid else "wrong-password",
+            }},
+            (200,) if valid else (401,),
+        )
+
+
+class AuthenticatedReads(Scenario):
+    """Reads of the current user with a session cookie."""
+    name = "authenticated_reads"
+
+    async def setup(self, client: httpx.AsyncClient) -> None:
+        email = self.email("reader")
+        await self.register(client, email)
+        self.cookie = await self.login(client, email)
+
+    def request(self, index: int) -> ScenarioRequest:
+        return ScenarioRequest(
+            "GET",
+            f"{settings.API_V1_STR}/users/me",
+            {"headers": {"Cookie": f"access_token={self.cookie}"}},
+            (200,),
+        )
+
+
+async def run_scenario(
+        client: httpx.AsyncClient,
+        scenario: Scenario,
+        slo: Slo,
+        concurrency: int,
+        requests: int
+) -> ScenarioReport:
+    await scenario.setup(client)
+
+    indices = iter(range(requests))
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indices:
+            method, url, kwargs, expected_statuses = scenario.request(index)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = str(response.status_code)
+                failed = response.status_code not in expected_statuses
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[status] += 1
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    report = ScenarioReport(
+        scenario=scenario.name,
+        requests=requests,
+        concurrency=concurrency,
+        duration_s=duration,
+        throughput_rps=requests / duration,
+        p50_ms=percentile(latencies, 0.50),
+        p90_ms=percentile(latencies, 0.90),
+        p99_ms=percentile(latencies, 0.99),
+        max_ms=max(latencies),
+        error_rate=errors / requests,
+        statuses=dict(statuses),
+        slo=slo,
+        violations=scenario.check(statuses),
+    )
+    if report.p99_ms > slo.p99_ms:
+        report.violations.append(f"p99 {report.p99_ms:.1f} ms > {slo.p99_ms:.1f} ms")
+    if report.error_rate > slo.max_error_rate:
+        report.violations.append(f"error rate {report.error_rate:.2%} > {slo.max_error_rate:.2%}")
+    if report.throughput_rps < slo.min_rps:
+        report.violations.append(f"throughput {report.throughput_rps:.1f} rps < {slo.min_rps:.1f} rps")
+
+    logger.info(
+        "%-20s %6d req  %8.1f rps  p50 %8.1f ms  p90 %8.1f ms  p99 %8.1f ms  errors %6.2f%%  %s",
+        report.scenario, report.requests, report.throughput_rps, report.p50_ms, report.p90_ms,
+        report.p99_ms, report.error_rate * 100, "; ".join(report.violations) or "SLO met"
+    )
+    return report
+
+
+def build_scenarios(names: list[str], run_id: str, invalid_ratio: float) -> list[Scenario]:
+    factories = {
+        RegisterStorm.name: lambda: RegisterStorm(run_id),
+        DuplicateRegister.name: lambda: DuplicateRegister(run_id),
+        LoginBurst.name: lambda: LoginBurst(run_id, invalid_ratio),
+        AuthenticatedReads.name: lambda: AuthenticatedReads(run_id),
+    }
+    return [factories[name]() for name in names]
+
+
+async def run(args: argparse.Namespace) -> list[ScenarioReport]:
+    slos = dict(DEFAULT_SLOS)
+    if args.slo_file:
+        slos.update({name: Slo.model_validate(slo) for name, slo in json.loads(args.slo_file.read_text()).items()})
+
+    engine = None
+    if args.base_url:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+        base_url = args.base_url
+    else:
+        from app.core.rate_limit import rate_limit
+        from app.main import app
+
+        # Every simulated client shares one address and would be rate limited
+        if not args.rate_limits:
+            app.dependency_overrides[rate_limit] = lambda: None
+
+        if args.database_url:
+            engine = create_benchmark_engine(args.database_url)
+
+            async def get_stand_in_db() -> AsyncGenerator[Session]:
+                with Session(engine) as session:
+                    yield session
+
+            app.dependency_overrides[get_db] = get_stand_in_db
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+
+    run_id = uuid.uuid4().hex[:8]
+    reports = []
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+            for scenario in build_scenarios(args.scenarios, run_id, args.invalid_ratio):
+                report = await run_scenario(client, scenario, slos[scenario.name], args.concurrency, args.requests)
+                if not args.base_url:
+                    report.db_executor = get_db_executor().stats()
+                    logger.info(
+                        "%-20s db executor: %d workers  queue %d  wait p50 %.1f ms  p99 %.1f ms  max %.1f ms",
+                        "", report.db_executor.max_workers, report.db_executor.queue_depth,
+                        report.db_executor.wait_p50_ms, report.db_executor.wait_p99_ms, report.db_executor.wait_max_ms
+                    )
+                reports.append(report)
+    finally:
+        if engine is not None:
+            with Session(engine) as session:
+                session.exec(delete(User).where(User.email.endswith(f"@{LOAD_EMAIL_DOMAIN}")))
+                session.commit()
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--scenarios", nargs="+", default=list(DEFAULT_SLOS),
+        choices=list(DEFAULT_SLOS), help="Scenarios to run, in order"
+    )
+    parser.add_argument("--base-url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--rate-limits", action="store_true", help="Keep the rate limits of the in-process app")
+    parser.add_argument("--database-url", help="Stand-in database for the in-process app, e.g. sqlite://")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients per scenario")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--invalid-ratio", type=float, default=0.3, help="Share of logins with a wrong password")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--slo-file", type=Path, help="JSON file overriding the default SLOs")
+    parser.add_argument("--output", type=Path, help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    reports = asyncio.run(run(args))
+
+    if args.output:
+        args.output.write_text(json.dumps([report.model_dump() for report in reports], indent=2) + "\n")
+    if any(report.violations for report in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
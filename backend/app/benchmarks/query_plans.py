@@ -0,0 +1,271 @@
+"""
+Query plan regression check for the repository query shapes.
+
+Runs every query shape issued by the repositories against a local Postgres with
+the migrations applied, captures the SQL they emit, and fails if the plan of a
+hot query contains a sequential scan, or if a query that must read its rows in
+index order contains a sort:
+
+    alembic upgrade head
+    python -m app.benchmarks.query_plans --rows 20000
+
+The check runs in a single transaction that is rolled back at the end: the seed
+rows, the statistics and every write done by the repositories are discarded.
+Sequential scans are disabled for the duration of the check, so a `Seq Scan` left
+in a plan means no index can serve the query, regardless of the table size.
+
+app/tests/benchmarks/test_query_plans.py runs the same check when the configured
+Postgres is reachable, as it is in CI.
+"""
+import argparse
+import datetime
+import logging
+import sys
+import uuid
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from sqlalchemy import Connection, create_engine, event, text
+from sqlmodel import Session
+
+from app.api.role.domain.role_models import Role
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.api.shared.domain.document_type import DocumentType
+from app.api.shared.infrastructure.outbox.outbox_dispatcher import claim_batch
+from app.api.user.domain.user_events import UserRegistered
+from app.api.user.domain.user_models import User
+from app.api.visitor.infrastructure.repository.sql.sql_alchemy_visitor_repository import (
+    SQLAlchemyVisitorRepository,
+)
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+PLANS_EMAIL_DOMAIN = "plans.qr-access.invalid"
+
+
+class QueryShape(NamedTuple):
+    name: str
+    run: Callable[[Session], Any]
+    hot: bool = True
+    index_ordered: bool = False
+
+
+def query_shapes(user: User, role: Role) -> list[QueryShape]:
+    """
+    Every query shape the application issues, with the filters it uses.
+    Cold shapes are reported but allowed to scan. Index ordered shapes have a LIMIT
+    that only stops the scan early if no sort sits between it and the index.
+    """
+
+    def users(session: Session) -> SQLAlchemyAggregateRootRepository[User]:
+        return SQLAlchemyAggregateRootRepository[User](session, User)
+
+    def roles(session: Session) -> SQLAlchemyAggregateRootRepository[Role]:
+        return SQLAlchemyAggregateRootRepository[Role](session, Role)
+
+    def new_user() -> User:
+        return User(email=f"new-{uuid.uuid4().hex}@{PLANS_EMAIL_DOMAIN}", hashed_password="x")
+
+    def register(session: Session) -> bool:
+        registered = new_user()
+        events = [UserRegistered(user_id=registered.id, email=registered.email)]
+        return users(session).insert_if_absent_sync(registered, events=events)
+
+    return [
+        QueryShape("users.find_sync(email)", lambda s: users(s).find_sync(email=user.email)),
+        QueryShape("users.find_sync(id)", lambda s: users(s).find_sync(id=user.id)),
+        QueryShape("users.find_sync(role_id)", lambda s: users(s).find_sync(role_id=role.id)),
+        QueryShape("users.exists_sync(email)", lambda s: users(s).exists_sync(email=user.email)),
+        QueryShape("users.get(id)", lambda s: s.get(User, user.id)),
+        QueryShape("users.insert_if_absent_sync", lambda s: users(s).insert_if_absent_sync(new_user())),
+        QueryShape("users.insert_if_absent_sync(events)", register),
+        QueryShape("users.save_sync", lambda s: users(s).save_sync(new_user())),
+        QueryShape("users.delete_sync(email)", lambda s: users(s).delete_sync(email=user.email)),
+        QueryShape(
+            "users.find_page_sync",
+            lambda s: users(s).find_page_sync(("created_at", "id"), 51, after=(user.created_at, user.id)),
+        ),
+        QueryShape("users.find_ids_sync", lambda s: users(s).find_ids_sync(), hot=False),
+        QueryShape("users.find_all_sync", lambda s: users(s).find_all_sync(), hot=False),
+        QueryShape("users.version_sync", lambda s: users(s).version_sync()),
+        QueryShape("roles.find_sync(name)", lambda s: roles(s).find_sync(name=role.name)),
+        QueryShape("roles.find_sync(id)", lambda s: roles(s).find_sync(id=role.id)),
+        QueryShape(
+            "visitors.find_sync(document)",
+            lambda s: SQLAlchemyVisitorRepository(s).find_sync(document_type=DocumentType.ID_CARD, document_number="0001234"),
+        ),
+        QueryShape(
+            "visitors.search_sync(number)",
+            lambda s: SQLAlchemyVisitorRepository(s).search_sync("00012", 10),
+            index_ordered=True,
+        ),
+        QueryShape(
+            "visitors.search_sync(name)",
+            lambda s: SQLAlchemyVisitorRepository(s).search_sync("maria gom", 10),
+            index_ordered=True,
+        ),
+        QueryShape(
+            "outbox.claim_batch",
+            lambda s: claim_batch(
+                s, settings.OUTBOX_BATCH_SIZE, datetime.timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+            ),
+        ),
+    ]
+
+
+def seed(connection: Connection, rows: int) -> None:
+    roles = max(rows // 100, 1)
+    connection.execute(
+        text(
+            "INSERT INTO roles (id, name) "
+            "SELECT gen_random_uuid(), 'plans-role-' || i FROM generate_series(1, :roles) AS i"
+        ),
+        {"roles": roles},
+    )
+    connection.execute(
+        text(
+            "INSERT INTO users (id, email, role_id, is_active, is_superuser, hashed_password, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'seed-' || i || '@' || :domain, "
+            "(SELECT id FROM roles WHERE name = 'plans-role-' || (1 + i % :roles)), "
+            "true, false, 'x', now(), now() "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {"rows": rows, "roles": roles, "domain": PLANS_EMAIL_DOMAIN},
+    )
+    connection.execute(
+        text(
+            "INSERT INTO visitors (id, document_type, document_number, full_name, created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'ID_CARD', lpad(i::text, 10, '0'), "
+            "(ARRAY['Maria', 'Juan', 'Ana', 'Luis', 'Sofia', 'Carlos'])[1 + i % 6] || ' ' || "
+            "(ARRAY['Gomez', 'Rodriguez', 'Lopez', 'Martinez', 'Garcia'])[1 + i % 5] || ' ' || i, "
+            "now(), now() "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {"rows": rows},
+    )
+    # A small backlog of pending messages among the sent ones, as in steady state
+    connection.execute(
+        text(
+            "INSERT INTO outbox_messages "
+            "(id, event_type, payload, status, attempts, created_at, available_at, sent_at) "
+            "SELECT gen_random_uuid(), 'user.registered', '{}'::jsonb, "
+            "CASE WHEN i % 100 = 0 THEN 'pending' ELSE 'sent' END, 0, now(), now(), "
+            "CASE WHEN i % 100 = 0 THEN NULL ELSE now() END "
+            "FROM generate_series(1, :rows) AS i"
+        ),
+        {"rows": rows},
+    )
+    connection.execute(text("ANALYZE users"))
+    connection.execute(text("ANALYZE visitors"))
+    connection.execute(text("ANALYZE roles"))
+    connection.execute(text("ANALYZE outbox_messages"))
+
+
+def seq_scans(plan: dict) -> list[str]:
+    """
+    Relations read by a sequential scan anywhere in an `EXPLAIN (FORMAT JSON)` plan.
+    """
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found += seq_scans(child)
+    return found
+
+
+def sorts(plan: dict) -> list[str]:
+    """
+    Sort keys of every sort node anywhere in an `EXPLAIN (FORMAT JSON)` plan.
+    """
+    found = []
+    if plan.get("Node Type") in ("Sort", "Incremental Sort"):
+        found.append(", ".join(plan.get("Sort Key", [])) or "?")
+    for child in plan.get("Plans", []):
+        found += sorts(child)
+    return found
+
+
+def capture_statements(connection: Connection, shape: QueryShape) -> list[tuple[str, Any]]:
+    """
+    Run a query shape in a savepoint and return the statements it sent, with their
+    parameters.
+    """
+    captured: list[tuple[str, Any]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, executemany) -> None:
+        if not executemany and statement.lstrip().split(" ", 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+            captured.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        with Session(bind=connection, join_transaction_mode="create_savepoint") as session:
+            shape.run(session)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    return captured
+
+
+def check(database_url: str, rows: int) -> list[str]:
+    engine = create_engine(database_url)
+    failures = []
+
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            seed(connection, rows)
+            connection.execute(text("SET LOCAL enable_seqscan = off"))
+
+            user = User(email=f"probe@{PLANS_EMAIL_DOMAIN}", hashed_password="x")
+            role = Role(name="plans-probe")
+            # The repositories commit: turn their commits into savepoint releases
+            with Session(
+                    bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False
+            ) as session:
+                session.add(role)
+                session.flush()
+                user.role_id = role.id
+                session.add(user)
+                session.commit()
+
+            for shape in query_shapes(user, role):
+                for statement, parameters in capture_statements(connection, shape):
+                    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar_one()
+                    scans = seq_scans(plan[0]["Plan"])
+                    sort_keys = sorts(plan[0]["Plan"]) if shape.index_ordered else []
+                    verdict = "ok"
+                    if scans:
+                        verdict = f"seq scan on {', '.join(scans)}" + ("" if shape.hot else " (allowed)")
+                        if shape.hot:
+                            failures.append(f"{shape.name}: {verdict}\n    {statement}")
+                    elif sort_keys:
+                        verdict = f"sort on {'; '.join(sort_keys)}"
+                        failures.append(f"{shape.name}: {verdict}\n    {statement}")
+                    logger.info("%-32s %-8s %s", shape.name, plan[0]["Plan"]["Node Type"], verdict)
+        finally:
+            transaction.rollback()
+
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--database-url", default=str(settings.SQLALCHEMY_DATABASE_URI),
+        help="Postgres database with the migrations applied, defaults to the configured one"
+    )
+    parser.add_argument("--rows", type=int, default=20000, help="Users to seed before planning")
+    args = parser.parse_args()
+
+    failures = check(args.database_url, args.rows)
+    if failures:
+        for failure in failures:
+            logger.error(failure)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
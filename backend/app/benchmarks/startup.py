@@ -0,0 +1,120 @@
+"""
+Startup-time benchmark of the backend entry points.
+
+Every target is imported in a fresh interpreter with `-X importtime`, so the
+measurement includes module execution (settings validation, engine creation,
+password hashing, ...) and not only byte-code loading:
+
+    python -m app.benchmarks.startup --rounds 10 --top 15
+
+The slowest modules of the last round are listed by self time, to point at
+whatever made startup slower. Results are compared against the committed
+`startup_baseline.json` like the microbenchmarks; `--save-baseline` records a new
+one and `--require-baseline` fails when there is none.
+"""
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+from app.benchmarks.harness import (
+    BenchmarkReport,
+    compare_to_baseline,
+    load_report,
+    save_report,
+    summarize,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGETS = ["app.main", "app.prestart", "app.backend_pre_start", "app.initial_data"]
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "startup_baseline.json"
+BACKEND_DIR = Path(__file__).parents[2]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_once(module: str) -> tuple[float, list[tuple[int, str]]]:
+    """
+    Import a module in a fresh interpreter.
+
+    :return: The cumulative import time of the module in seconds, and the
+        (self time in microseconds, module) pairs of everything it imported.
+    """
+    env = {**os.environ, "PYTHONPATH": str(BACKEND_DIR)}
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative = 0.0
+    modules = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, _, name = match.groups()
+        modules.append((int(self_us), name))
+        if name == module:
+            cumulative = int(cumulative_us) / 1e6
+    return cumulative, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="Modules to import")
+    parser.add_argument("--rounds", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest modules to list")
+    parser.add_argument("--output", type=Path, help="Where to write the JSON results")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="Baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown, on top of the noise")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true", help="Fail when there is no baseline to compare to")
+    args = parser.parse_args()
+
+    results = []
+    for target in args.targets:
+        samples = []
+        for _ in range(args.rounds):
+            cumulative, modules = import_once(target)
+            samples.append(cumulative)
+
+        result = summarize(f"import {target}", samples)
+        results.append(result)
+        logger.info("import %-30s median %8.1f ms  min %8.1f ms", target, result.median * 1e3, result.min * 1e3)
+        for self_us, name in sorted(modules, reverse=True)[:args.top]:
+            logger.info("    %8.1f ms  %s", self_us / 1e3, name)
+
+    report = BenchmarkReport(suite="startup", results=results)
+    if args.output:
+        save_report(report, args.output)
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        logger.info("Baseline saved to %s", args.baseline)
+        return
+
+    baseline = load_report(args.baseline)
+    if baseline is None:
+        if args.require_baseline:
+            logger.error("No baseline found at %s", args.baseline)
+            sys.exit(1)
+        logger.info("No baseline found at %s, skipping comparison", args.baseline)
+        return
+
+    regressions = compare_to_baseline(report, baseline, args.threshold)
+    if regressions:
+        for regression in regressions:
+            logger.error(regression)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
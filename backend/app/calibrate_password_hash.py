@@ -0,0 +1,91 @@
+"""
+Calibrate the bcrypt cost of password hashes to this host.
+
+    python app/calibrate_password_hash.py --target-ms 250
+    python app/calibrate_password_hash.py --target-ms 250 --write-env ../.env
+
+Hashes a password at increasing costs and recommends the highest one whose median
+hash time stays within the target, never below `--min-rounds`. With `--write-env`
+the recommendation is persisted as `PASSWORD_BCRYPT_ROUNDS` in the given env file.
+
+Existing hashes do not need a reset: a user whose hash has a lower cost gets it
+re-hashed with the configured one after their next successful login. Hashes with a
+higher cost are kept, lowering the cost never downgrades them.
+"""
+import argparse
+import logging
+import re
+import statistics
+import time
+from pathlib import Path
+
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CALIBRATION_PASSWORD = "calibration-password"
+# Each extra round doubles the hash time
+MAX_ROUNDS = 20
+
+
+def measure(rounds: int, samples: int) -> float:
+    """
+    :return: The median time in milliseconds to hash a password at the given cost.
+    """
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash(CALIBRATION_PASSWORD)
+        timings.append((time.perf_counter() - start) * 1e3)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms: float, min_rounds: int, samples: int) -> int:
+    recommended = min_rounds
+    for rounds in range(min_rounds, MAX_ROUNDS + 1):
+        median_ms = measure(rounds, samples)
+        within = median_ms <= target_ms
+        logger.info("rounds %2d: %8.1f ms%s", rounds, median_ms, "" if within else " (over target)")
+        if not within:
+            break
+        recommended = rounds
+    return recommended
+
+
+def write_env(path: Path, rounds: int) -> None:
+    line = f"PASSWORD_BCRYPT_ROUNDS={rounds}"
+    content = path.read_text() if path.exists() else ""
+    pattern = re.compile(r"^PASSWORD_BCRYPT_ROUNDS=.*$", re.MULTILINE)
+    if pattern.search(content):
+        content = pattern.sub(line, content)
+    else:
+        content += ("" if not content or content.endswith("\n") else "\n") + line + "\n"
+    path.write_text(content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS,
+        help="Hash time budget of a login on this host"
+    )
+    parser.add_argument("--min-rounds", type=int, default=10, help="Never recommend a lower cost")
+    parser.add_argument("--samples", type=int, default=5, help="Hashes timed per cost")
+    parser.add_argument("--write-env", type=Path, help="Env file to persist PASSWORD_BCRYPT_ROUNDS into")
+    args = parser.parse_args()
+
+    logger.info("Calibrating bcrypt for a %.0f ms target", args.target_ms)
+    rounds = calibrate(args.target_ms, args.min_rounds, args.samples)
+    logger.info("Recommended PASSWORD_BCRYPT_ROUNDS=%d (configured: %d)", rounds, settings.PASSWORD_BCRYPT_ROUNDS)
+
+    if args.write_env:
+        write_env(args.write_env, rounds)
+        logger.info("Written to %s", args.write_env)
+
+
+if __name__ == "__main__":
+    main()
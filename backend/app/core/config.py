@@ -39,6 +39,37 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # minutes
     ALGORITHM: str = "HS256"
 
+    # Password hash cost, see app/calibrate_password_hash.py. Hashes with another
+    # cost are upgraded on the next successful login.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_TARGET_MS: float = 250.0
+
+    # Lifetime of the token bridging the password and the OTP steps of a 2FA login
+    TWO_FACTOR_CHALLENGE_EXPIRE_MINUTES: int = 5
+    # Used (user, code) pairs remembered to reject replayed OTPs
+    TOTP_REPLAY_CACHE_SIZE: int = 10000
+
+    # Rate limits per route id (see custom_generate_unique_id in app.main), in the
+    # `limits` notation, e.g. "10/minute". Set a storage URI such as
+    # "async+redis://redis:6379" to share the counters between workers.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DEFAULT: str = "120/minute"
+    RATE_LIMITS: dict[str, str] = {
+        "Auth-register": "5/minute",
+        "Auth-login": "10/minute",
+        "Auth-login_two_factor": "10/minute",
+        "Auth-enable_two_factor": "10/minute",
+        # Typeahead, one request per keystroke
+        "Visitor-search_visitors": "600/minute",
+    }
+    RATE_LIMIT_STORAGE_URI: str | None = None
+    RATE_LIMIT_MAX_KEYS: int = 100000
+    # Addresses or networks of the reverse proxies in front of the backend (e.g.
+    # the Docker network of Traefik, "172.16.0.0/12"), comma-separated. Anonymous
+    # requests coming through them are keyed on the client address they forward
+    # in X-Forwarded-For; otherwise every client would share the proxy's limit.
+    TRUSTED_PROXIES: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+
     FAILED_LOGIN_ATTEMPTS: int = 5
     LOCKOUT_DURATION_MINUTES: int = 15  # minutes
 
@@ -49,6 +80,16 @@ class Settings(BaseSettings):
         "admin": "Admin access",
     }
 
+    # On-demand request profiling (superusers only, see app.core.profiling)
+    PROFILING_ENABLED: bool = True
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILING_MAX_PER_MINUTE: int = 6
+    PROFILING_OUTPUT_DIR: str = "/tmp/qr-access-profiles"
+    PROFILING_MAX_ARTIFACTS: int = 100
+
+    # How long a worker serves its role catalog snapshot before checking the version
+    ROLE_CATALOG_REFRESH_SECONDS: float = 5.0
+
     FRONTEND_URL: str = "http://127.0.0.1:3000"
 
     BACKEND_CORS_ORIGINS: Annotated[
@@ -68,6 +109,12 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # Connection pool, the database executor runs one thread per connection
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Jobs queued longer than this for a database executor thread are logged
+    DB_EXECUTOR_SLOW_WAIT_MS: float = 100.0
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> MultiHostUrl:
@@ -83,5 +130,29 @@ class Settings(BaseSettings):
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    SMTP_TLS: bool = True
+    SMTP_SSL: bool = False
+    SMTP_PORT: int = 587
+    SMTP_HOST: str | None = None
+    SMTP_USER: str | None = None
+    SMTP_PASSWORD: str | None = None
+    EMAILS_FROM_EMAIL: EmailStr | None = None
+    SMTP_POOL_SIZE: int = 4
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def emails_enabled(self) -> bool:
+        return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
+
+    # Delivery of the domain events recorded in the outbox, see app/dispatch_outbox.py
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 2.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: float = 30.0
+    # How long a claimed batch is hidden from the other dispatchers while it is sent
+    OUTBOX_LEASE_SECONDS: float = 300.0
+    OUTBOX_RETENTION_DAYS: int = 7
+
 
 settings = Settings()  # type: ignore
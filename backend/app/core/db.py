@@ -1,38 +1,169 @@
-from sqlmodel import create_engine, Session, select
+import datetime
+import hashlib
+import json
+import uuid
+from functools import cache
+
+from sqlalchemy import BigInteger, Engine
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Field, Session, SQLModel, create_engine, select
 
-from app.api.role.domain.role_models import Role
-from app.api.user.domain.user_models import User
-from app.core import security
 from app.core.config import settings
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+# Bump whenever init_db seeds something new, so deployed databases get re-seeded
+SEED_VERSION = 1
+SEED_NAME = "initial_data"
+
+
+class SeedFingerprint(SQLModel, table=True):
+    """
+    Fingerprint of the seed data last applied by `seed_db`.
+
+    :since: 0.0.1
+    """
+    __tablename__ = "seed_fingerprints"
+
+    name: str = Field(primary_key=True, max_length=255)
+    fingerprint: str = Field(nullable=False, max_length=64)
+    updated_at: datetime.datetime = Field(
+        nullable=False,
+        default_factory=lambda: datetime.datetime.now(datetime.UTC)
+    )
+
+
+class CatalogVersion(SQLModel, table=True):
+    """
+    Version counter of a cached catalog, bumped in the same transaction as every
+    write to it so that all workers can tell when their snapshot is stale.
+
+    :since: 0.0.1
+    """
+    __tablename__ = "catalog_versions"
+
+    name: str = Field(primary_key=True, max_length=255)
+    version: int = Field(nullable=False, default=0, sa_type=BigInteger)
+
+
+def read_catalog_version(session: Session, name: str) -> int:
+    version = session.exec(select(CatalogVersion.version).where(CatalogVersion.name == name)).first()
+    return version or 0
+
+
+def bump_catalog_version(session: Session, name: str) -> None:
+    """
+    Increment the version of a catalog without committing, so the bump lands in
+    the same transaction as the write that goes with it.
+
+    :param session: The session the write is done with.
+    :param name: The name of the catalog.
+    :since: 0.0.1
+    """
+    dialect = session.get_bind().dialect.name
+    upsert = {"postgresql": insert, "sqlite": sqlite.insert}[dialect]
+    statement = upsert(CatalogVersion).values(name=name, version=1)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[CatalogVersion.name],
+            set_={"version": CatalogVersion.version + 1},
+        )
+    )
+
+
+@cache
+def get_engine() -> Engine:
+    """
+    Create the engine on first use.
+
+    Importing this module stays cheap for processes that never reach the database,
+    and the models are only imported once a session is about to be opened. They must
+    all be registered before then so the relationships between them can be resolved.
+    """
+    from app.api.role.domain.role_models import Role  # noqa
+    from app.api.shared.infrastructure.outbox.outbox_models import OutboxMessage  # noqa
+    from app.api.user.domain.user_models import User  # noqa
+    from app.api.visitor.domain.visitor_models import Visitor  # noqa
+
+    return create_engine(
+        str(settings.SQLALCHEMY_DATABASE_URI),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+    )
 
 
 def init_db(session: Session) -> None:
+    """
+    Seed the admin role and the first superuser.
+
+    Each record is a single `INSERT ... ON CONFLICT DO NOTHING`, so running it
+    again is harmless and never races with another prestart process. The role
+    catalog version is bumped in the same transaction if a role was inserted, so
+    running workers reload their snapshots.
+    """
+    from app.api.role.domain.role_models import ROLE_CATALOG, Role
+    from app.api.user.domain.user_models import User
+    from app.core import security
+
     # Tables should be created with Alembic migrations
     # But if you don't want to use migrations, create
     # the tables un-commenting the next lines
     # from sqlmodel import SQLModel
 
     # This works because the models are already imported and registered from app.models
-    # SQLModel.metadata.create_all(engine)
-
-    role = session.exec(select(Role).where(Role.name == "admin")).first()
-    if not role:
-        role = Role(name="admin")
-        session.add(role)
-        session.commit()
-        session.refresh(role)
-
-    user = session.exec(
-        select(User).where(User.email == settings.FIRST_SUPERUSER)
-    ).first()
-    if not user:
-        user_in = User(
-            email=settings.FIRST_SUPERUSER,
+    # SQLModel.metadata.create_all(get_engine())
+
+    roles = session.execute(
+        insert(Role)
+        .values(id=uuid.uuid4(), name="admin")
+        .on_conflict_do_nothing(index_elements=[Role.name])
+    )
+    if roles.rowcount:
+        bump_catalog_version(session, ROLE_CATALOG)
+
+    now = datetime.datetime.now(datetime.UTC)
+    session.execute(
+        insert(User)
+        .values(
+            id=uuid.uuid4(),
+            email=settings.FIRST_SUPERUSER.lower(),
             hashed_password=security.get_password_hash(settings.FIRST_SUPERUSER_PASSWORD),
+            is_active=True,
             is_superuser=True,
-            role_id=role.id,
+            role_id=select(Role.id).where(Role.name == "admin").scalar_subquery(),
+            created_at=now,
+            updated_at=now,
         )
-        session.add(user_in)
-        session.commit()
\ No newline at end of file
+        .on_conflict_do_nothing()
+    )
+    session.commit()
+
+
+def seed_fingerprint() -> str:
+    """
+    Fingerprint of everything `init_db` writes. The superuser password is left out:
+    an existing superuser is never updated, so changing it does not call for a re-seed.
+    """
+    seed = {
+        "version": SEED_VERSION,
+        "roles": ["admin"],
+        "superuser": settings.FIRST_SUPERUSER.lower(),
+    }
+    return hashlib.sha256(json.dumps(seed, sort_keys=True).encode()).hexdigest()
+
+
+def seed_db(session: Session) -> bool:
+    """
+    Run `init_db` unless the stored fingerprint shows the same seed data was
+    already applied.
+
+    :return: True if the database was seeded, False if it was skipped.
+    """
+    fingerprint = seed_fingerprint()
+    applied = session.get(SeedFingerprint, SEED_NAME)
+    if applied and applied.fingerprint == fingerprint:
+        return False
+
+    init_db(session)
+    session.merge(SeedFingerprint(name=SEED_NAME, fingerprint=fingerprint))
+    session.commit()
+    return True
@@ -0,0 +1,176 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Recent wait times kept for the percentiles
+WAIT_SAMPLES = 1024
+
+
+class DatabaseExecutorStats(BaseModel):
+    """
+    Point-in-time metrics of the database executor. Times are in milliseconds.
+
+    :since: 0.0.1
+    """
+    max_workers: int
+    queue_depth: int
+    running: int
+    completed: int
+    wait_p50_ms: float
+    wait_p99_ms: float
+    wait_max_ms: float
+
+
+class DatabaseExecutor:
+    """
+    Thread pool dedicated to blocking database work.
+
+    It is sized to the connection pool, so that jobs beyond the pool size queue
+    here, where the queue depth and the time spent waiting are measured, rather
+    than in a worker thread waiting for a connection. That only holds while
+    connections are not kept between jobs: `run_in_session` ends the transaction
+    of read-only work, so a request does not hold a connection while it awaits
+    something else (password hashing, another service). A request in the middle
+    of a write still does, and can make a job wait for a connection, up to the
+    pool timeout, once more requests than connections are writing.
+
+    Password hashing and anything else sent to `asyncio.to_thread` no longer
+    competes with the database for the same threads.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, max_workers: int, slow_wait_ms: float):
+        self.max_workers = max_workers
+        self.slow_wait_ms = slow_wait_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+        self._max_wait = 0.0
+
+    async def run[R](self, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """
+        Run a blocking callable in the executor, with the context variables of
+        the caller like `asyncio.to_thread`.
+
+        :return: The result of the callable.
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, fn, *args, **kwargs)
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._measured, call, submitted_at
+        )
+
+    def _measured[R](self, call: Callable[[], R], submitted_at: float) -> R:
+        wait = time.perf_counter() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._waits.append(wait)
+            self._max_wait = max(self._max_wait, wait)
+        if wait * 1e3 > self.slow_wait_ms:
+            logger.warning("Database job waited %.1f ms for a worker", wait * 1e3)
+
+        try:
+            return call()
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def stats(self) -> DatabaseExecutorStats:
+        with self._lock:
+            waits = sorted(self._waits)
+            queued, running, completed, max_wait = self._queued, self._running, self._completed, self._max_wait
+
+        def percentile(fraction: float) -> float:
+            return waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1e3 if waits else 0.0
+
+        return DatabaseExecutorStats(
+            max_workers=self.max_workers,
+            queue_depth=queued,
+            running=running,
+            completed=completed,
+            wait_p50_ms=percentile(0.5),
+            wait_p99_ms=percentile(0.99),
+            wait_max_ms=max_wait * 1e3,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+@cache
+def get_db_executor() -> DatabaseExecutor:
+    return DatabaseExecutor(
+        max_workers=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+        slow_wait_ms=settings.DB_EXECUTOR_SLOW_WAIT_MS,
+    )
+
+
+def session_lock(session: Session) -> threading.Lock:
+    """
+    The lock guarding a session against concurrent use from several threads.
+    """
+    lock = session.info.get("lock")
+    if lock is None:
+        lock = session.info.setdefault("lock", threading.Lock())
+    return lock
+
+
+def release_connection(session: Session) -> None:
+    """
+    End the transaction of a session that has nothing left to write, returning
+    its connection to the pool until the next query.
+
+    The session should not expire its objects on commit, or they would be
+    reloaded on their next attribute access, outside of the executor.
+    """
+    if session.in_transaction() and not (session.new or session.dirty or session.deleted):
+        session.commit()
+
+
+async def run_in_session[R](session: Session, fn: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+    """
+    Run blocking work on a session in the database executor.
+
+    The work holds the session lock, so concurrent coroutines sharing a request
+    session are serialized instead of using it from two threads at once. Once it
+    succeeded, the connection is released unless there are changes left to
+    write, so it is not held while the caller awaits anything else. Each job then
+    runs in its own transaction.
+
+    :param session: The session the callable uses, created with
+        `expire_on_commit=False`.
+    :return: The result of the callable.
+    """
+
+    def locked() -> R:
+        with session_lock(session):
+            result = fn(*args, **kwargs)
+            release_connection(session)
+            return result
+
+    return await get_db_executor().run(locked)
@@ -0,0 +1,144 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from email.utils import formataddr
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def build_email(to: str, subject: str, text: str) -> EmailMessage:
+    """
+    A plain text email from the configured sender.
+    """
+    message = EmailMessage()
+    message["From"] = formataddr((settings.PROJECT_NAME, str(settings.EMAILS_FROM_EMAIL)))
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(text)
+    return message
+
+
+class SMTPConnectionPool:
+    """
+    Bounded pool of authenticated SMTP connections shared by threads.
+
+    Opening a connection costs a TCP handshake, STARTTLS and a login, which would
+    dominate the time to send a single email. Connections are kept open and
+    reused, at most `size` at a time. A connection the server dropped while idle
+    is replaced once, transparently, before an error is reported.
+
+    :since: 0.0.1
+    """
+
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            user: str | None = None,
+            password: str | None = None,
+            use_tls: bool = True,
+            use_ssl: bool = False,
+            size: int = 4,
+            timeout: float = 10.0
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.use_tls = use_tls
+        self.use_ssl = use_ssl
+        self.size = size
+        self.timeout = timeout
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @classmethod
+    def from_settings(cls) -> "SMTPConnectionPool":
+        return cls(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            user=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            use_tls=settings.SMTP_TLS,
+            use_ssl=settings.SMTP_SSL,
+            size=settings.SMTP_POOL_SIZE,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+
+    def _connect(self) -> smtplib.SMTP:
+        start = time.perf_counter()
+        if self.use_ssl:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                smtp.starttls()
+        if self.user:
+            smtp.login(self.user, self.password or "")
+        logger.debug("Opened SMTP connection to %s:%d in %.1f ms", self.host, self.port, (time.perf_counter() - start) * 1e3)
+        return smtp
+
+    @staticmethod
+    def _discard(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.close()
+        except OSError:
+            pass
+
+    def send(self, message: EmailMessage) -> None:
+        """
+        Send an email over a pooled connection, blocking while all of them are busy.
+
+        :raises smtplib.SMTPException: If the server rejects the email.
+        :raises OSError: If the server cannot be reached.
+        """
+        with self._slots:
+            try:
+                smtp = self._idle.get_nowait()
+                reused = True
+            except queue.Empty:
+                smtp = self._connect()
+                reused = False
+
+            try:
+                smtp.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                self._discard(smtp)
+                if not reused:
+                    raise
+                # Closed by the server while idle, retry once on a fresh connection
+                smtp = self._connect()
+                try:
+                    smtp.send_message(message)
+                except BaseException:
+                    self._discard(smtp)
+                    raise
+            except smtplib.SMTPException:
+                # Rejected email, the connection itself is still usable
+                try:
+                    smtp.rset()
+                except (smtplib.SMTPException, OSError):
+                    self._discard(smtp)
+                    raise
+                self._idle.put(smtp)
+                raise
+            except BaseException:
+                self._discard(smtp)
+                raise
+            self._idle.put(smtp)
+
+    def close(self) -> None:
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._discard(smtp)
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from jose import JWTError
+from sqlmodel import Session
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.api.user.domain.user_models import User
+from app.core import security
+from app.core.config import settings
+from app.core.db import get_engine
+from app.core.db_executor import get_db_executor
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY_PARAM = "_profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_STATUS_HEADER = "X-Profile-Status"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler that periodically samples the stacks of every thread.
+
+    A daemon thread wakes up every `interval` seconds, walks the current frame of
+    each thread (`sys._current_frames`) and counts the collapsed stacks. Nothing is
+    installed in the profiled threads themselves, so the overhead is bounded by the
+    sampling rate rather than by the number of function calls.
+
+    Samples are keyed by thread name, so both the event loop and the worker threads
+    used by the async repositories show up in the same artifact.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        """
+        Stop sampling and return the collected samples.
+
+        :return: A counter mapping collapsed stacks to the number of samples.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_qualname}")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+class ProfileRateLimiter:
+    """
+    Token bucket bounding how many requests may be profiled per minute.
+
+    Only a single profile may run at a time: concurrent profiles would sample each
+    other's threads and multiply the overhead.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = max(per_minute, 0)
+        self.rate = self.capacity / 60.0
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.running = threading.Lock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        """
+        Consume a token and take the running slot.
+
+        :return: True if the caller may profile, False if it must not.
+        """
+        if not self.running.acquire(blocking=False):
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+        self.running.release()
+        return False
+
+    def release(self) -> None:
+        self.running.release()
+
+
+def write_collapsed_stacks(samples: Counter[str], output_dir: Path, profile_id: str) -> Path:
+    """
+    Write samples in the collapsed-stack format understood by flamegraph.pl,
+    speedscope and inferno, pruning the oldest artifacts above the configured limit.
+
+    :return: The path of the written artifact.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / f"{profile_id}.collapsed"
+    with path.open("w") as f:
+        for stack, count in samples.most_common():
+            f.write(f"{stack} {count}\n")
+
+    artifacts = sorted(output_dir.glob("*.collapsed"), key=os.path.getmtime)
+    for stale in artifacts[:max(len(artifacts) - settings.PROFILING_MAX_ARTIFACTS, 0)]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Profile a single request when a superuser explicitly asks for it.
+
+    The request opts in with the `X-Profile: 1` header or the `_profile=1` query
+    parameter and must carry the access token of an active superuser, either in the
+    `access_token` cookie or as a bearer token. Any other request goes straight to
+    the application; the token is only decoded when the flag is present.
+
+    The collapsed stacks are stored under `PROFILING_OUTPUT_DIR` and the artifact id
+    is returned in the `X-Profile-Id` header. When the rate limit is exhausted the
+    request is served unprofiled with `X-Profile-Status: rate-limited`.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, app, limiter: ProfileRateLimiter | None = None):
+        super().__init__(app)
+        self.limiter = limiter or ProfileRateLimiter(settings.PROFILING_MAX_PER_MINUTE)
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if not self.is_requested(request):
+            return await call_next(request)
+
+        if not await self.is_superuser(request):
+            return await call_next(request)
+
+        if not self.limiter.try_acquire():
+            response = await call_next(request)
+            response.headers[PROFILE_STATUS_HEADER] = "rate-limited"
+            return response
+
+        try:
+            profiler = SamplingProfiler(settings.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+            profiler.start()
+            try:
+                response = await call_next(request)
+            finally:
+                samples = profiler.stop()
+        finally:
+            self.limiter.release()
+
+        profile_id = uuid.uuid4().hex
+        path = await asyncio.to_thread(
+            write_collapsed_stacks, samples, Path(settings.PROFILING_OUTPUT_DIR), profile_id
+        )
+        logger.info("Profiled %s %s into %s", request.method, request.url.path, path)
+
+        response.headers[PROFILE_ID_HEADER] = profile_id
+        response.headers[PROFILE_STATUS_HEADER] = "profiled"
+        return response
+
+    @staticmethod
+    def is_requested(request: Request) -> bool:
+        return request.headers.get(PROFILE_HEADER) == "1" or request.query_params.get(PROFILE_QUERY_PARAM) == "1"
+
+    @staticmethod
+    async def is_superuser(request: Request) -> bool:
+        token = security.extract_access_token(request)
+        if not token:
+            return False
+
+        try:
+            payload = security.decode_access_token(token)
+            user_id = uuid.UUID(payload["sub"])
+        except (JWTError, KeyError, ValueError):
+            return False
+
+        def load_user() -> User | None:
+            with Session(get_engine()) as session:
+                return session.get(User, user_id)
+
+        user = await get_db_executor().run(load_user)
+        return user is not None and user.is_active and user.is_superuser
@@ -0,0 +1,231 @@
+import ipaddress
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import cache, lru_cache
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError
+from limits import RateLimitItem, parse
+
+from app.core import security
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketStore:
+    """
+    In-process token buckets of a single rate limit, one per key.
+
+    A bucket holds up to `capacity` tokens and refills continuously at `rate`
+    tokens per second; every request takes one. Each check is O(1): the bucket is
+    refilled lazily from the time of its last use. A bucket idle long enough to be
+    full again carries no state, so buckets are kept in least recently used order
+    and idle ones are evicted from the front as new requests come in. Past
+    `max_keys` the least recently used bucket is evicted regardless.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, rate: float, capacity: float, max_keys: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        # Time after which an unused bucket is full again
+        self.idle_after = capacity / rate
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, now: float | None = None) -> float:
+        """
+        Take a token from the bucket of a key.
+
+        :return: 0 if the request is allowed, otherwise the seconds until a token
+            is available.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [self.capacity, now]
+                self._buckets[key] = bucket
+                self._evict(now)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / self.rate
+
+    def _evict(self, now: float) -> None:
+        # At most two idle buckets per new key, enough to keep up with insertions
+        for _ in range(2):
+            key, (_, last_used) = next(iter(self._buckets.items()))
+            if now - last_used < self.idle_after:
+                break
+            del self._buckets[key]
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RateLimiter:
+    """
+    Rate limits per route and per client or principal.
+
+    Limits use the `limits` notation (e.g. "10/minute") and are looked up by the
+    route id built by `custom_generate_unique_id` ("Auth-login"), falling back to
+    the default limit. They are enforced with in-process token buckets, or with a
+    shared `limits` storage (e.g. "async+redis://...") when a storage URI is set,
+    so that all workers share the same counters.
+
+    :since: 0.0.1
+    """
+
+    def __init__(
+            self,
+            default_limit: str,
+            route_limits: dict[str, str],
+            max_keys: int,
+            storage_uri: str | None = None
+    ):
+        self.default_limit = parse(default_limit)
+        self.route_limits = {route_id: parse(limit) for route_id, limit in route_limits.items()}
+        self.max_keys = max_keys
+        self._stores: dict[str, TokenBucketStore] = {}
+        self._shared = None
+        if storage_uri:
+            # Only imported when a shared store is configured
+            from limits.aio.storage import storage_from_string
+            from limits.aio.strategies import SlidingWindowCounterRateLimiter
+
+            self._shared = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+
+    def limit_for(self, route_id: str) -> RateLimitItem:
+        return self.route_limits.get(route_id, self.default_limit)
+
+    def store_for(self, route_id: str) -> TokenBucketStore:
+        store = self._stores.get(route_id)
+        if store is None:
+            limit = self.limit_for(route_id)
+            store = TokenBucketStore(limit.amount / limit.get_expiry(), limit.amount, self.max_keys)
+            store = self._stores.setdefault(route_id, store)
+        return store
+
+    async def hit(self, route_id: str, key: str) -> float:
+        """
+        Count a request of a client on a route.
+
+        :return: 0 if the request is allowed, otherwise the seconds to wait.
+        """
+        if self._shared is None:
+            return self.store_for(route_id).hit(key)
+
+        limit = self.limit_for(route_id)
+        if await self._shared.hit(limit, route_id, key):
+            return 0.0
+        stats = await self._shared.get_window_stats(limit, route_id, key)
+        return max(stats.reset_time - time.time(), 0.0)
+
+    async def check(self, request: Request) -> None:
+        """
+        Count a request against the limit of its matched route.
+
+        :raises HTTPException: 429 with a `Retry-After` header when over the limit.
+        """
+        route = request.scope.get("route")
+        route_id = getattr(route, "unique_id", None) or request.url.path
+
+        retry_after = await self.hit(route_id, client_key(request))
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+def client_key(request: Request) -> str:
+    """
+    The principal of an authenticated request, or else the client address.
+
+    Only a verified access token counts: keying on an unverified subject would
+    let a client dodge its limit or exhaust someone else's.
+    """
+    token = security.extract_access_token(request)
+    if token:
+        try:
+            return f"user:{security.decode_access_token(token)['sub']}"
+        except (JWTError, KeyError):
+            pass
+    return f"ip:{client_address(request)}"
+
+
+@cache
+def trusted_proxies() -> tuple[ipaddress.IPv4Network | ipaddress.IPv6Network, ...]:
+    return tuple(ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES)
+
+
+@lru_cache(maxsize=1024)
+def is_trusted_proxy(address: str) -> bool:
+    """
+    Cached per address: the same few proxies forward every request.
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted_proxies())
+
+
+def client_address(request: Request) -> str:
+    """
+    The address of the client, through the trusted proxies (`TRUSTED_PROXIES`).
+
+    `X-Forwarded-For` is only read when the peer is a trusted proxy, and from the
+    right: every proxy appends the address it got the request from, so the first
+    untrusted address is the client. Anything left of it may be forged.
+
+    When uvicorn already resolves the client with `--proxy-headers` and
+    `--forwarded-allow-ips`, the peer is the client and no proxy is trusted here.
+    """
+    address = request.client.host if request.client else "unknown"
+    # No proxy configured, the common case: no address parsing at all
+    if not trusted_proxies() or not is_trusted_proxy(address):
+        return address
+
+    forwarded = [hop.strip() for hop in ",".join(request.headers.getlist("X-Forwarded-For")).split(",") if hop.strip()]
+    for hop in reversed(forwarded):
+        address = hop
+        if not is_trusted_proxy(hop):
+            break
+    return address
+
+
+@cache
+def get_rate_limiter() -> RateLimiter:
+    return RateLimiter(
+        default_limit=settings.RATE_LIMIT_DEFAULT,
+        route_limits=settings.RATE_LIMITS,
+        max_keys=settings.RATE_LIMIT_MAX_KEYS,
+        storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    )
+
+
+async def rate_limit(request: Request) -> None:
+    """
+    App-wide dependency enforcing the rate limit of the matched route.
+
+    It runs once routing is done, so the route id is known, and before the
+    dependencies of the route, so a limited request never reaches the database
+    or a password hash.
+    """
+    await get_rate_limiter().check(request)
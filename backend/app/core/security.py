@@ -1,20 +1,31 @@
+import threading
+import time
 import uuid
-from datetime import timedelta, datetime, timezone
-from typing import Optional
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from functools import cache, lru_cache
 
 import pyotp
-from jose import jwt
+from fastapi import Request
 from fastapi.security import OAuth2PasswordBearer
+from jose import jwt
+from jose.exceptions import ExpiredSignatureError
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 
 from app.core.config import settings
 
 ACCESS_AUD = "access"
 REFRESH_AUD = "refresh"
+TWO_FACTOR_AUD = "2fa"
+
+# pyotp default time step, in seconds
+TOTP_INTERVAL = 30
+# Accept the codes of the previous and next time steps too
+TOTP_VALID_WINDOW = 1
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS)
 
-DUMMY_HASHED_PASSWORD = pwd_context.hash("dummy_password")
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=settings.OAUTH2_TOKEN_URL,
@@ -23,7 +34,7 @@ oauth2_scheme = OAuth2PasswordBearer(
 )
 
 
-def create_access_token(subject: str, aud: str, ttl: timedelta, extra: Optional[dict] | None = None) -> tuple[str, str]:
+def create_access_token(subject: str, aud: str, ttl: timedelta, extra: dict | None = None) -> tuple[str, str]:
     """
     Sign a JWT token with the given subject, audience, and time-to-live.
 
@@ -34,7 +45,7 @@ def create_access_token(subject: str, aud: str, ttl: timedelta, extra: Optional[
     :return: Signed JWT token as a string.
     """
     jti = str(uuid.uuid4())
-    now = datetime.now(timezone.utc)
+    now = datetime.now(UTC)
     payload = {
         "sub": subject,
         "aud": aud,
@@ -50,6 +61,61 @@ def create_access_token(subject: str, aud: str, ttl: timedelta, extra: Optional[
     return token, jti
 
 
+@lru_cache(maxsize=4096)
+def _verify_access_token(token: str, aud: str) -> dict:
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], audience=aud)
+
+
+def decode_access_token(token: str, aud: str = ACCESS_AUD) -> dict:
+    """
+    Verify a JWT token signed by `create_access_token` and return its claims.
+
+    Verified tokens are cached, since the same token comes back on every request
+    of a session and is checked by both the rate limiter and the authentication.
+    Only the expiry is time-dependent, it is checked again on every call.
+
+    :param token: The encoded JWT token.
+    :param aud: The audience the token must have been issued for.
+    :return: The decoded claims, not to be modified.
+    :raises jose.JWTError: If the signature, audience or expiry is invalid.
+    """
+    claims = _verify_access_token(token, aud)
+    if "exp" in claims and claims["exp"] < datetime.now(UTC).timestamp():
+        raise ExpiredSignatureError("Signature has expired.")
+    return claims
+
+
+def extract_access_token(request: Request) -> str | None:
+    """
+    Read the access token from the `access_token` cookie set on login, falling back
+    to an `Authorization: Bearer` header.
+
+    :return: The encoded token, or None if the request carries none.
+    """
+    token = request.cookies.get("access_token")
+    if token:
+        return token
+
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, credentials = authorization.partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
+    return None
+
+
+@cache
+def get_dummy_hashed_password() -> str:
+    """
+    Hash verified against when a login targets an unknown user, so that the
+    response takes as long as for a wrong password.
+
+    It is built by the lifespan of the app, before the first request, instead of
+    at import time, keeping a full bcrypt hash out of the import of every module
+    and out of the prestart scripts.
+    """
+    return pwd_context.hash("dummy_password")
+
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
@@ -59,13 +125,81 @@ def get_password_hash(password) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Whether a hash is weaker than the configured one: another scheme, or a bcrypt
+    cost below the configured rounds. A stronger hash is kept when the rounds are
+    lowered, re-hashing it would downgrade it.
+    Only the hash header is parsed, no hashing is done.
+    """
+    try:
+        rounds = bcrypt.from_string(hashed_password).rounds
+    except ValueError:
+        return pwd_context.needs_update(hashed_password)
+    return rounds < settings.PASSWORD_BCRYPT_ROUNDS
+
+
 def generate_2fa_secret_key() -> str:
     return pyotp.random_base32()
 
 
+@lru_cache(maxsize=1024)
+def get_totp(secret: str) -> pyotp.TOTP:
+    """
+    The TOTP generator of a secret, reused across verifications of the same user.
+    """
+    return pyotp.TOTP(secret, interval=TOTP_INTERVAL)
+
+
 def get_totp_uri(secret: str, username: str, issuer_name="qr-access") -> str:
-    return pyotp.TOTP(secret).provisioning_uri(name=username, issuer_name=issuer_name)
+    return get_totp(secret).provisioning_uri(name=username, issuer_name=issuer_name)
 
 
 def verify_2fa_token(secret: str, token: str) -> bool:
-    return pyotp.TOTP(secret).verify(token, valid_window=1)  # Allow a 30-second window for token validity
+    return get_totp(secret).verify(token, valid_window=TOTP_VALID_WINDOW)
+
+
+class TotpReplayCache:
+    """
+    Bounded, time-expiring set of the (user, code) pairs already used to log in.
+
+    A code stays valid for the whole verification window, so it is remembered for
+    as long: within that time it cannot be submitted twice. Entries all live for
+    the same time, so insertion order is expiry order and both expiry and
+    eviction pop from the oldest end. Once full, the oldest entries are evicted
+    first, even if they have not expired yet.
+
+    The cache is per process: a replay sent to another worker is not caught.
+
+    :since: 0.0.1
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._used: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def use(self, user_id: str, code: str) -> bool:
+        """
+        Record a code as used by a user.
+
+        :return: True on first use, False if it was already used.
+        """
+        now = time.monotonic()
+        key = (user_id, code)
+        with self._lock:
+            while self._used and next(iter(self._used.values())) <= now:
+                self._used.popitem(last=False)
+            if key in self._used:
+                return False
+            self._used[key] = now + self.ttl
+            if len(self._used) > self.max_size:
+                self._used.popitem(last=False)
+            return True
+
+
+totp_replay_cache = TotpReplayCache(
+    ttl=TOTP_INTERVAL * (2 * TOTP_VALID_WINDOW + 1),
+    max_size=settings.TOTP_REPLAY_CACHE_SIZE,
+)
@@ -0,0 +1,68 @@
+"""
+Deliver the domain events recorded in the outbox as emails.
+
+    python app/dispatch_outbox.py
+    python app/dispatch_outbox.py --once
+
+Runs until interrupted (SIGINT or SIGTERM), claiming due messages in batches of
+`OUTBOX_BATCH_SIZE` and sending them over a pool of `SMTP_POOL_SIZE` connections.
+Any number of dispatchers can run at once: a batch claimed by one is skipped by
+the others. With `--once` a single batch is dispatched and the script exits.
+With emails disabled (no `SMTP_HOST` or `EMAILS_FROM_EMAIL`) there is nothing to
+dispatch to: the messages are left in the outbox, to be sent once emails are
+configured, and the script exits cleanly.
+
+In local development, `docker-compose.override.yml` points the dispatcher at its
+mailcatcher service, the emails are shown at http://localhost:1080.
+"""
+import argparse
+import datetime
+import logging
+import signal
+import threading
+
+from app.api.shared.infrastructure.outbox.outbox_dispatcher import OutboxDispatcher
+from app.api.user.application.user_notifications import NOTIFICATIONS
+from app.core.config import settings
+from app.core.db import get_engine
+from app.core.email import SMTPConnectionPool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--once", action="store_true", help="Dispatch a single batch and exit")
+    args = parser.parse_args()
+
+    if not settings.emails_enabled:
+        logger.warning("Emails are disabled, set SMTP_HOST and EMAILS_FROM_EMAIL to dispatch the outbox")
+        return
+
+    dispatcher = OutboxDispatcher(
+        engine=get_engine(),
+        notifications=NOTIFICATIONS,
+        smtp_pool=SMTPConnectionPool.from_settings(),
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+        retry_base_seconds=settings.OUTBOX_RETRY_BASE_SECONDS,
+        retention=datetime.timedelta(days=settings.OUTBOX_RETENTION_DAYS),
+        lease=datetime.timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+    )
+    try:
+        if args.once:
+            dispatcher.dispatch_batch()
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        logger.info("Dispatching the outbox to %s:%d", settings.SMTP_HOST, settings.SMTP_PORT)
+        dispatcher.run(settings.OUTBOX_POLL_INTERVAL_SECONDS, stop)
+    finally:
+        dispatcher.close()
+
+
+if __name__ == "__main__":
+    main()
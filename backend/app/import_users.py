@@ -0,0 +1,270 @@
+"""
+Bulk import of users from a CSV or NDJSON file.
+
+    python app/import_users.py users.csv --rejects rejects.ndjson
+
+Every record has an `email` and a `password`, and optionally the name of a `role`
+and the `is_active` / `is_superuser` flags. The file is read incrementally and
+processed in batches, so memory stays constant whatever its size:
+
+- passwords of a batch are hashed across a process pool while the previous batch
+  is being written,
+- each batch is loaded with COPY into a temporary staging table and merged into
+  `users` with a single `INSERT ... SELECT ... ON CONFLICT DO NOTHING`.
+
+Records that fail validation, reference an unknown role, already exist or repeat
+an earlier email are rejected and written to the `--rejects` file, if given. So
+are those inserted by someone else while their batch is being merged.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, NamedTuple, TextIO
+
+from pydantic import ValidationError
+from sqlmodel import Field
+
+from app.api.user.domain.user_models import UserCreate
+from app.core import security
+from app.core.db import get_engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STAGING_COLUMNS = ("line_no", "email", "hashed_password", "role", "is_active", "is_superuser")
+
+CREATE_STAGING_TABLE = """
+CREATE TEMP TABLE IF NOT EXISTS users_import (
+    line_no bigint NOT NULL,
+    email text NOT NULL,
+    hashed_password text NOT NULL,
+    role text,
+    is_active boolean NOT NULL,
+    is_superuser boolean NOT NULL
+)
+"""
+
+SELECT_REJECTED = """
+SELECT s.line_no, s.email,
+    CASE
+        WHEN s.role IS NOT NULL AND r.id IS NULL THEN 'unknown role'
+        WHEN EXISTS (SELECT 1 FROM users u WHERE u.email = s.email) THEN 'already exists'
+        ELSE 'duplicate in input'
+    END
+FROM users_import s
+LEFT JOIN roles r ON r.name = s.role
+WHERE (s.role IS NOT NULL AND r.id IS NULL)
+    OR EXISTS (SELECT 1 FROM users u WHERE u.email = s.email)
+    OR EXISTS (SELECT 1 FROM users_import d WHERE d.email = s.email AND d.line_no < s.line_no)
+"""
+
+MERGE_INTO_USERS = """
+INSERT INTO users (id, email, role_id, is_active, is_superuser, hashed_password, created_at, updated_at)
+SELECT DISTINCT ON (s.email)
+    gen_random_uuid(), s.email, r.id, s.is_active, s.is_superuser, s.hashed_password, now(), now()
+FROM users_import s
+LEFT JOIN roles r ON r.name = s.role
+WHERE s.role IS NULL OR r.id IS NOT NULL
+ORDER BY s.email, s.line_no
+ON CONFLICT DO NOTHING
+RETURNING email
+"""
+
+
+class ImportUser(UserCreate):
+    """
+    A record of the file: the user to create, and the name of their role.
+    """
+    role: str | None = Field(default=None, max_length=255)
+
+
+class ImportRecord(NamedTuple):
+    line_no: int
+    email: str
+    password: str
+    role: str | None
+    is_active: bool
+    is_superuser: bool
+
+
+class ImportStats:
+    def __init__(self) -> None:
+        self.read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.read / (time.perf_counter() - self.started_at)
+
+    def log(self) -> None:
+        logger.info(
+            "%d read, %d imported, %d rejected (%.1f rows/s)",
+            self.read, self.imported, self.rejected, self.rows_per_sec
+        )
+
+
+def read_rows(file: TextIO, file_format: str) -> Iterator[tuple[int, dict[str, Any] | str]]:
+    """
+    :return: The line number and fields of every record, or the reason why a line
+        is not a record at all, so that it is rejected without aborting the import.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        for line_no, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, f"Malformed JSON: {e.msg}"
+                continue
+            if not isinstance(row, dict):
+                yield line_no, f"Expected a JSON object, got {type(row).__name__}"
+                continue
+            yield line_no, row
+
+
+def parse_records(
+        rows: Iterable[tuple[int, dict[str, Any] | str]],
+        rejects: TextIO | None,
+        stats: ImportStats
+) -> Iterator[ImportRecord]:
+    for line_no, row in rows:
+        stats.read += 1
+        if isinstance(row, str):
+            reject(rejects, stats, line_no, None, row)
+            continue
+        # Empty CSV cells fall back to the model defaults
+        row = {key: value for key, value in row.items() if value not in ("", None)}
+        try:
+            user = ImportUser.model_validate(row)
+        except ValidationError as e:
+            reason = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+            email = row.get("email")
+            reject(rejects, stats, line_no, email if isinstance(email, str) else None, reason)
+            continue
+        yield ImportRecord(line_no, user.email, user.password, user.role, user.is_active, user.is_superuser)
+
+
+def reject(rejects: TextIO | None, stats: ImportStats, line_no: int, email: str | None, reason: str) -> None:
+    stats.rejected += 1
+    if rejects is not None:
+        rejects.write(json.dumps({"line": line_no, "email": email, "reason": reason}) + "\n")
+
+
+def batched(records: Iterable[ImportRecord], size: int) -> Iterator[list[ImportRecord]]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def hash_batch(pool: Executor, batch: list[ImportRecord], workers: int) -> Iterator[str]:
+    chunksize = max(1, len(batch) // (workers * 4))
+    return pool.map(security.get_password_hash, [record.password for record in batch], chunksize=chunksize)
+
+
+def load_batch(connection: Any, batch: list[ImportRecord], hashes: Iterator[str], rejects: TextIO | None, stats: ImportStats) -> None:
+    """
+    COPY a hashed batch into the staging table, record what will be rejected and
+    merge the rest into users, in one transaction.
+
+    A record that passed the checks but was not merged lost the race to a user
+    inserted concurrently with the same email, it is rejected as well so that
+    every record ends up either imported or rejected.
+    """
+    with connection.cursor() as cursor:
+        with cursor.copy(f"COPY users_import ({', '.join(STAGING_COLUMNS)}) FROM STDIN") as copy:
+            for record, hashed_password in zip(batch, hashes, strict=True):
+                copy.write_row((
+                    record.line_no, record.email, hashed_password,
+                    record.role, record.is_active, record.is_superuser,
+                ))
+
+        cursor.execute(SELECT_REJECTED)
+        rejected = set()
+        for line_no, email, reason in cursor:
+            rejected.add(line_no)
+            reject(rejects, stats, line_no, email, reason)
+
+        cursor.execute(MERGE_INTO_USERS)
+        merged = {email for email, in cursor}
+        stats.imported += len(merged)
+        for record in batch:
+            if record.line_no not in rejected and record.email not in merged:
+                reject(rejects, stats, record.line_no, record.email, "already exists")
+
+        cursor.execute("TRUNCATE users_import")
+    connection.commit()
+
+
+def import_users(
+        path: Path,
+        file_format: str,
+        rejects: TextIO | None,
+        batch_size: int,
+        workers: int
+) -> ImportStats:
+    stats = ImportStats()
+    raw_connection = get_engine().raw_connection()
+    connection = raw_connection.driver_connection
+
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(CREATE_STAGING_TABLE)
+        connection.commit()
+
+        with path.open(newline="") as file, ProcessPoolExecutor(max_workers=workers) as pool:
+            records = parse_records(read_rows(file, file_format), rejects, stats)
+
+            # Hash the next batch in the pool while the current one is written
+            pending = None
+            for batch in batched(records, batch_size):
+                hashes = hash_batch(pool, batch, workers)
+                if pending is not None:
+                    load_batch(connection, *pending, rejects, stats)
+                    stats.log()
+                pending = (batch, hashes)
+            if pending is not None:
+                load_batch(connection, *pending, rejects, stats)
+    finally:
+        raw_connection.close()
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path, help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--rejects", type=Path, help="Where to write the rejected records as NDJSON")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Records hashed and merged at a time")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processes hashing passwords")
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+
+    logger.info("Importing users from %s", args.path)
+    rejects = args.rejects.open("w") if args.rejects else None
+    try:
+        stats = import_users(args.path, file_format, rejects, args.batch_size, args.workers)
+    finally:
+        if rejects is not None:
+            rejects.close()
+    stats.log()
+    logger.info("Users imported")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,30 @@
-from fastapi import FastAPI
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.core import security
 from app.core.config import settings
+from app.core.profiling import ProfilingMiddleware
+from app.core.rate_limit import rate_limit
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Hashed before the first request, or the first login of an unknown user
+    # would pay for it and take twice as long as a wrong password
+    await asyncio.to_thread(security.get_dummy_hashed_password)
+    yield
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.PROJECT_VERSION,
@@ -18,8 +33,13 @@ app = FastAPI(
     docs_url=f"{settings.API_V1_STR}/docs",
     redoc_url=f"{settings.API_V1_STR}/redoc",
     generate_unique_id=custom_generate_unique_id,
+    lifespan=lifespan,
+    dependencies=[Depends(rate_limit)] if settings.RATE_LIMIT_ENABLED else None,
 )
 
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 if settings.all_cors_origins:
     app.add_middleware(
         CORSMiddleware,
@@ -29,4 +49,5 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
-app.include_router(api_router, prefix=settings.API_V1_STR)
+# Routes of included routers keep their own default id unless it is passed here
+app.include_router(api_router, prefix=settings.API_V1_STR, generate_unique_id_function=custom_generate_unique_id)
@@ -0,0 +1,71 @@
+import logging
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Engine, text
+from sqlmodel import Session
+from tenacity import before_sleep_log, retry, stop_after_delay, wait_random_exponential
+
+from app.core.db import get_engine, seed_db
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+max_wait_seconds = 60 * 5  # 5 minutes
+max_backoff_seconds = 10
+
+ALEMBIC_INI = Path(__file__).parents[1] / "alembic.ini"
+
+
+@retry(
+    stop=stop_after_delay(max_wait_seconds),
+    # Exponential backoff with full jitter: starts at ~100ms, caps at 10s
+    wait=wait_random_exponential(multiplier=0.1, max=max_backoff_seconds),
+    before_sleep=before_sleep_log(logger, logging.WARN),
+    reraise=True,
+)
+def wait_for_db(db_engine: Engine) -> None:
+    with db_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def run_migrations(db_engine: Engine) -> None:
+    config = Config(str(ALEMBIC_INI))
+    # Alembic manages the transactions itself, some migrations need to run
+    # outside of one (CREATE INDEX CONCURRENTLY)
+    with db_engine.connect() as connection:
+        # Picked up by app/alembic/env.py instead of creating another engine
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+def seed(db_engine: Engine) -> None:
+    with Session(db_engine) as session:
+        if seed_db(session):
+            logger.info("Initial data created")
+        else:
+            logger.info("Seed data unchanged, skipping")
+
+
+def main() -> None:
+    """
+    Single-process replacement for backend_pre_start.py, `alembic upgrade head`
+    and initial_data.py, sharing one interpreter and one engine.
+    """
+    db_engine = get_engine()
+
+    logger.info("Waiting for the database")
+    wait_for_db(db_engine)
+
+    logger.info("Running migrations")
+    run_migrations(db_engine)
+
+    logger.info("Creating initial data")
+    seed(db_engine)
+
+    logger.info("Service finished initializing")
+
+
+if __name__ == "__main__":
+    main()
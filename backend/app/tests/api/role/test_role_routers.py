@@ -0,0 +1,111 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.api.role.domain.role_models import ROLE_CATALOG, Role
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.core.config import settings
+from app.core.db import read_catalog_version
+from app.tests.utils.db import captured_statements
+from app.tests.utils.user import auth_headers, create_user
+
+ROLES_URL = f"{settings.API_V1_STR}/roles/"
+
+
+def catalog_version(engine: Engine) -> int:
+    with Session(engine) as session:
+        return read_catalog_version(session, ROLE_CATALOG)
+
+
+@pytest.fixture
+def superuser_headers(engine: Engine) -> dict[str, str]:
+    return auth_headers(create_user(engine, is_superuser=True))
+
+
+def test_create_role_bumps_catalog_only_on_insert(
+        client: TestClient, engine: Engine, superuser_headers: dict[str, str]
+) -> None:
+    name = f"role-{uuid.uuid4().hex}"
+    before = catalog_version(engine)
+
+    r = client.post(ROLES_URL, headers=superuser_headers, json={"name": name})
+    assert r.status_code == 201
+    assert catalog_version(engine) == before + 1
+
+    r = client.post(ROLES_URL, headers=superuser_headers, json={"name": name})
+    assert r.status_code == 400
+    assert catalog_version(engine) == before + 1
+
+
+def test_delete_role_assigned_concurrently(
+        client: TestClient, engine: Engine, superuser_headers: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    role_id = client.post(ROLES_URL, headers=superuser_headers, json={"name": f"role-{uuid.uuid4().hex}"}).json()["id"]
+    create_user(engine, role_id=uuid.UUID(role_id))
+    before = catalog_version(engine)
+
+    # The user is assigned after the check for assigned users
+    async def not_assigned(_self, **_filters) -> bool:
+        return False
+
+    monkeypatch.setattr(SQLAlchemyAggregateRootRepository, "exists_async", not_assigned)
+
+    r = client.delete(f"{ROLES_URL}{role_id}", headers=superuser_headers)
+
+    assert r.status_code == 409
+    assert catalog_version(engine) == before
+    with Session(engine) as session:
+        assert session.get(Role, uuid.UUID(role_id)) is not None
+
+
+def test_delete_role(client: TestClient, engine: Engine, superuser_headers: dict[str, str]) -> None:
+    role_id = client.post(ROLES_URL, headers=superuser_headers, json={"name": f"role-{uuid.uuid4().hex}"}).json()["id"]
+    before = catalog_version(engine)
+
+    r = client.delete(f"{ROLES_URL}{role_id}", headers=superuser_headers)
+
+    assert r.status_code == 204
+    assert catalog_version(engine) == before + 1
+    assert client.get(f"{ROLES_URL}{role_id}", headers=superuser_headers).status_code == 404
+
+
+def test_read_roles_not_modified(client: TestClient, superuser_headers: dict[str, str]) -> None:
+    role_id = client.post(ROLES_URL, headers=superuser_headers, json={"name": f"role-{uuid.uuid4().hex}"}).json()["id"]
+    r = client.get(ROLES_URL, headers=superuser_headers)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    role_etag = client.get(f"{ROLES_URL}{role_id}", headers=superuser_headers).headers["ETag"]
+
+    r = client.get(ROLES_URL, headers={**superuser_headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    r = client.get(f"{ROLES_URL}{role_id}", headers={**superuser_headers, "If-None-Match": role_etag})
+    assert r.status_code == 304
+
+    # A new role changes the catalog, not the role that already existed
+    client.post(ROLES_URL, headers=superuser_headers, json={"name": f"role-{uuid.uuid4().hex}"})
+    r = client.get(ROLES_URL, headers={**superuser_headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+    r = client.get(f"{ROLES_URL}{role_id}", headers={**superuser_headers, "If-None-Match": role_etag})
+    assert r.status_code == 304
+
+
+def test_read_roles_from_snapshot_without_query(
+        client: TestClient, engine: Engine, superuser_headers: dict[str, str]
+) -> None:
+    role_id = client.post(ROLES_URL, headers=superuser_headers, json={"name": f"role-{uuid.uuid4().hex}"}).json()["id"]
+    # Reloads the snapshot invalidated by the write
+    with captured_statements(engine) as statements:
+        assert client.get(ROLES_URL, headers=superuser_headers).status_code == 200
+    assert statements
+
+    with captured_statements(engine) as statements:
+        assert client.get(ROLES_URL, headers=superuser_headers).status_code == 200
+        assert client.get(f"{ROLES_URL}{role_id}", headers=superuser_headers).status_code == 200
+    assert statements == []
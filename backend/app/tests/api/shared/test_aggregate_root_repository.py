@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.api.shared.aggregate.infrastructure.repository.sql.sql_alchemy_aggregate_root_repository import (
+    SQLAlchemyAggregateRootRepository,
+)
+from app.api.user.domain.user_events import UserRegistered
+from app.api.user.domain.user_models import User
+from app.tests.utils.user import create_user, random_email, registered_events
+
+DOMAIN_MODULES = (
+    "app.api.shared.aggregate.domain.repository.aggregate_root_repository",
+    "app.api.shared.aggregate.domain.repository.async_aggregate_root_repository",
+)
+
+
+def test_domain_repositories_do_not_depend_on_infrastructure() -> None:
+    imports = "; ".join(f"import {module}" for module in DOMAIN_MODULES)
+    loaded = subprocess.run(
+        [sys.executable, "-c", f"import sys; {imports}; print(' '.join(sys.modules))"],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+
+    assert not [module for module in loaded if module.startswith(("app.core", "sqlalchemy", "sqlmodel"))]
+
+
+def test_save_records_events_in_the_same_transaction(engine: Engine) -> None:
+    user = User(email=random_email(), hashed_password="x")
+    with Session(engine, expire_on_commit=False) as session:
+        SQLAlchemyAggregateRootRepository[User](session, User).save_sync(
+            user, events=[UserRegistered(user_id=user.id, email=user.email)]
+        )
+
+    [message] = registered_events(engine, user.email)
+    assert message.payload == {"user_id": str(user.id), "email": user.email}
+
+
+def test_events_are_not_recorded_when_the_save_fails(engine: Engine) -> None:
+    existing = create_user(engine)
+    user = User(email=existing.email, hashed_password="x")
+    with Session(engine) as session:
+        with pytest.raises(IntegrityError):
+            SQLAlchemyAggregateRootRepository[User](session, User).save_sync(
+                user, events=[UserRegistered(user_id=user.id, email=user.email)]
+            )
+
+    assert registered_events(engine, user.email) == []
+
+
+def test_insert_if_absent_records_events_only_when_inserted(engine: Engine) -> None:
+    user = User(email=random_email(), hashed_password="x")
+    duplicate = User(email=user.email, hashed_password="x")
+    with Session(engine, expire_on_commit=False) as session:
+        user_repo = SQLAlchemyAggregateRootRepository[User](session, User)
+        assert user_repo.insert_if_absent_sync(user, events=[UserRegistered(user_id=user.id, email=user.email)])
+        assert not user_repo.insert_if_absent_sync(
+            duplicate, events=[UserRegistered(user_id=duplicate.id, email=duplicate.email)]
+        )
+
+    [message] = registered_events(engine, user.email)
+    assert message.payload["user_id"] == str(user.id)
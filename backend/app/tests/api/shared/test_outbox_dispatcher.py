@@ -0,0 +1,151 @@
+import datetime
+import socket
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import SMTP, Envelope
+from aiosmtpd.smtp import Session as SMTPSession
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.api.shared.infrastructure.outbox.outbox_dispatcher import (
+    OutboxDispatcher,
+    claim_batch,
+)
+from app.api.shared.infrastructure.outbox.outbox_models import (
+    OUTBOX_DEAD,
+    OUTBOX_PENDING,
+    OUTBOX_SENT,
+    OutboxMessage,
+)
+from app.api.user.application.user_notifications import NOTIFICATIONS
+from app.api.user.domain.user_events import UserRegistered
+from app.core.email import SMTPConnectionPool
+from app.tests.utils.user import random_email
+
+# Older than anything the other tests leave in the outbox, so claimed first
+LONG_AGO = datetime.datetime(2000, 1, 1, tzinfo=datetime.UTC)
+
+
+class Mailbox:
+    """
+    Local SMTP stand-in keeping the emails it accepts, and rejecting those sent to
+    the addresses in `rejected`.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.port = 0
+        self.received: list[str] = []
+        self.rejected: set[str] = set()
+        # Database connections checked out while each email was being received
+        self.checked_out: list[int] = []
+
+    async def handle_DATA(self, server: SMTP, session: SMTPSession, envelope: Envelope) -> str:
+        self.checked_out.append(self.engine.pool.checkedout())
+        if self.rejected.intersection(envelope.rcpt_tos):
+            return "550 Mailbox unavailable"
+        self.received += envelope.rcpt_tos
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def mailbox(engine: Engine, smtp_port: int) -> Iterator[Mailbox]:
+    mailbox = Mailbox(engine)
+    controller = Controller(mailbox, hostname="127.0.0.1", port=smtp_port)
+    controller.start()
+    mailbox.port = smtp_port
+    yield mailbox
+    controller.stop()
+
+
+@pytest.fixture
+def dispatcher(engine: Engine, mailbox: Mailbox) -> Iterator[OutboxDispatcher]:
+    dispatcher = OutboxDispatcher(
+        engine=engine,
+        notifications=NOTIFICATIONS,
+        smtp_pool=SMTPConnectionPool("127.0.0.1", mailbox.port, use_tls=False, size=2),
+        batch_size=3,
+        max_attempts=2,
+        retry_base_seconds=60,
+        retention=datetime.timedelta(days=1),
+        lease=datetime.timedelta(minutes=5),
+    )
+    yield dispatcher
+    dispatcher.close()
+
+
+def add_messages(engine: Engine, emails: list[str], attempts: int = 0) -> list[OutboxMessage]:
+    with Session(engine, expire_on_commit=False) as session:
+        messages = [OutboxMessage.from_event(UserRegistered(user_id=uuid.uuid4(), email=email)) for email in emails]
+        for message in messages:
+            message.available_at = LONG_AGO
+            message.attempts = attempts
+        session.add_all(messages)
+        session.commit()
+    return messages
+
+
+def reload(engine: Engine, messages: list[OutboxMessage]) -> list[OutboxMessage]:
+    with Session(engine) as session:
+        return [session.get(OutboxMessage, message.id) for message in messages]
+
+
+def test_dispatch_sends_outside_transaction(engine: Engine, mailbox: Mailbox, dispatcher: OutboxDispatcher) -> None:
+    emails = [random_email() for _ in range(3)]
+    mailbox.rejected.add(emails[2])
+    messages = add_messages(engine, emails)
+
+    assert dispatcher.dispatch_batch() == 3
+
+    assert sorted(mailbox.received) == sorted(emails[:2])
+    # No connection, let alone a transaction, held while the emails were sent
+    assert mailbox.checked_out == [0, 0, 0]
+    sent, also_sent, failed = reload(engine, messages)
+    assert sent.status == also_sent.status == OUTBOX_SENT
+    assert sent.attempts == 1 and sent.sent_at is not None
+    assert failed.status == OUTBOX_PENDING
+    assert failed.attempts == 1
+    assert "550" in failed.last_error
+    # Retried after the backoff, not after the lease
+    retry_at = failed.available_at.replace(tzinfo=datetime.UTC)
+    assert retry_at - datetime.datetime.now(datetime.UTC) < datetime.timedelta(seconds=61)
+
+
+def test_dispatch_gives_up_after_max_attempts(
+        engine: Engine, mailbox: Mailbox, dispatcher: OutboxDispatcher
+) -> None:
+    email = random_email()
+    mailbox.rejected.add(email)
+    messages = add_messages(engine, [email], attempts=1)
+
+    dispatcher.dispatch_batch()
+
+    [dead] = reload(engine, messages)
+    assert dead.status == OUTBOX_DEAD
+    assert dead.attempts == 2
+
+
+def test_leased_messages_are_not_claimed_again(
+        engine: Engine, mailbox: Mailbox, dispatcher: OutboxDispatcher
+) -> None:
+    emails = [random_email() for _ in range(2)]
+    messages = add_messages(engine, emails)
+    with Session(engine) as session:
+        # Claimed by a dispatcher that is still sending them
+        claim_batch(session, 2, datetime.timedelta(minutes=5))
+        session.commit()
+
+    dispatcher.dispatch_batch()
+
+    assert not set(emails).intersection(mailbox.received)
+    assert [message.attempts for message in reload(engine, messages)] == [1, 1]
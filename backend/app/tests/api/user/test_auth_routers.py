@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+from sqlalchemy import Engine
+from sqlmodel import Session, func, select
+
+from app.api.role.domain.role_models import Role
+from app.api.user.domain.user_models import User
+from app.core import security
+from app.core.config import settings
+from app.main import app
+from app.tests.utils.user import create_user, random_email, registered_events
+
+REGISTER_URL = f"{settings.API_V1_STR}/auth/register"
+LOGIN_URL = f"{settings.API_V1_STR}/auth/login"
+
+
+def test_register(client: TestClient, engine: Engine) -> None:
+    email = random_email()
+
+    r = client.post(REGISTER_URL, json={"email": email.upper(), "password": "password123"})
+
+    assert r.status_code == 201
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == email)).one()
+    assert user.is_active
+    assert not user.is_superuser
+    # Recorded whether or not emails are configured, the dispatcher decides
+    [message] = registered_events(engine, email)
+    assert message.payload["user_id"] == str(user.id)
+
+
+def test_register_ignores_privileges(client: TestClient, engine: Engine) -> None:
+    with Session(engine, expire_on_commit=False) as session:
+        role = Role(name=f"role-{random_email()}")
+        session.add(role)
+        session.commit()
+    email = random_email()
+
+    r = client.post(
+        REGISTER_URL,
+        json={"email": email, "password": "password123", "is_superuser": True, "role_id": str(role.id)},
+    )
+
+    assert r.status_code == 201
+    with Session(engine) as session:
+        user = session.exec(select(User).where(User.email == email)).one()
+    assert not user.is_superuser
+    assert user.role_id is None
+
+
+def test_register_existing_email(client: TestClient, engine: Engine) -> None:
+    email = random_email()
+    client.post(REGISTER_URL, json={"email": email, "password": "password123"})
+
+    r = client.post(REGISTER_URL, json={"email": email.upper(), "password": "password123"})
+
+    assert r.status_code == 400
+    assert len(registered_events(engine, email)) == 1
+
+
+def test_concurrent_registrations_of_same_email(engine: Engine) -> None:
+    email = random_email()
+    attempts = 20
+
+    async def register_all() -> list[httpx.Response]:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post(REGISTER_URL, json={"email": email, "password": "password123"})
+                for _ in range(attempts)
+            ))
+
+    responses = asyncio.run(register_all())
+
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [201] + [400] * (attempts - 1)
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(User).where(User.email == email)).one() == 1
+
+
+def test_login_releases_connection_while_hashing(
+        client: TestClient, engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_user(engine)
+    verify_password = security.verify_password
+    checked_out: list[int] = []
+
+    def verify_and_count(plain_password: str, hashed_password: str) -> bool:
+        checked_out.append(engine.pool.checkedout())
+        return verify_password(plain_password, hashed_password)
+
+    monkeypatch.setattr(security, "verify_password", verify_and_count)
+
+    r = client.post(LOGIN_URL, data={"username": user.email, "password": "password123"})
+
+    assert r.status_code == 200
+    assert "access_token" in r.cookies
+    assert checked_out == [0]
+
+
+def hash_rounds(engine: Engine, user: User) -> int:
+    with Session(engine) as session:
+        return bcrypt.from_string(session.get(User, user.id).hashed_password).rounds
+
+
+def test_login_rehashes_weaker_password_hash(
+        client: TestClient, engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = create_user(engine)
+    rounds = settings.PASSWORD_BCRYPT_ROUNDS + 1
+    monkeypatch.setattr(settings, "PASSWORD_BCRYPT_ROUNDS", rounds)
+    monkeypatch.setattr(security, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds))
+
+    r = client.post(LOGIN_URL, data={"username": user.email, "password": "password123"})
+
+    assert r.status_code == 200
+    # The test client runs the background task before returning
+    assert hash_rounds(engine, user) == rounds
+    r = client.post(LOGIN_URL, data={"username": user.email, "password": "password123"})
+    assert r.status_code == 200
+
+
+def test_login_keeps_stronger_password_hash(client: TestClient, engine: Engine) -> None:
+    rounds = settings.PASSWORD_BCRYPT_ROUNDS + 1
+    user = create_user(engine)
+    with Session(engine) as session:
+        stored = session.get(User, user.id)
+        stored.hashed_password = bcrypt.using(rounds=rounds).hash("password123")
+        session.add(stored)
+        session.commit()
+
+    r = client.post(LOGIN_URL, data={"username": user.email, "password": "password123"})
+
+    assert r.status_code == 200
+    assert hash_rounds(engine, user) == rounds
@@ -0,0 +1,86 @@
+import pyotp
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.api.user.domain.user_models import User
+from app.core import security
+from app.core.config import settings
+from app.tests.utils.user import create_user
+
+LOGIN_URL = f"{settings.API_V1_STR}/auth/login"
+LOGIN_2FA_URL = f"{settings.API_V1_STR}/auth/login/2fa"
+
+
+@pytest.fixture
+def two_factor_user(engine: Engine) -> User:
+    return create_user(engine, totp_secret=security.generate_2fa_secret_key(), totp_enabled=True)
+
+
+def challenge(client: TestClient, user: User) -> str:
+    r = client.post(LOGIN_URL, data={"username": user.email, "password": "password123"})
+    assert r.status_code == 200
+    return r.json()["challenge_token"]
+
+
+def wrong_code(user: User) -> str:
+    code = pyotp.TOTP(user.totp_secret).now()
+    return f"{(int(code) + 500000) % 1000000:06d}"
+
+
+def test_login_two_factor(client: TestClient, two_factor_user: User) -> None:
+    r = client.post(LOGIN_2FA_URL, json={
+        "challenge_token": challenge(client, two_factor_user),
+        "code": pyotp.TOTP(two_factor_user.totp_secret).now(),
+    })
+
+    assert r.status_code == 200
+    assert "access_token" in r.cookies
+
+
+def test_code_cannot_be_replayed(client: TestClient, engine: Engine, two_factor_user: User) -> None:
+    code = pyotp.TOTP(two_factor_user.totp_secret).now()
+    r = client.post(LOGIN_2FA_URL, json={"challenge_token": challenge(client, two_factor_user), "code": code})
+    assert r.status_code == 200
+
+    # Same code within its window, even with a fresh challenge
+    r = client.post(LOGIN_2FA_URL, json={"challenge_token": challenge(client, two_factor_user), "code": code})
+
+    assert r.status_code == 401
+    with Session(engine) as session:
+        assert session.get(User, two_factor_user.id).totp_failed_attempts == 1
+
+
+def test_locked_after_too_many_wrong_codes(client: TestClient, engine: Engine, two_factor_user: User) -> None:
+    challenge_token = challenge(client, two_factor_user)
+
+    for _ in range(settings.FAILED_LOGIN_ATTEMPTS):
+        r = client.post(LOGIN_2FA_URL, json={"challenge_token": challenge_token, "code": wrong_code(two_factor_user)})
+        assert r.status_code == 401
+
+    # Locked for every challenge of the user, even with the right code
+    for token in (challenge_token, challenge(client, two_factor_user)):
+        r = client.post(LOGIN_2FA_URL, json={
+            "challenge_token": token,
+            "code": pyotp.TOTP(two_factor_user.totp_secret).now(),
+        })
+        assert r.status_code == 429
+
+    with Session(engine) as session:
+        assert session.get(User, two_factor_user.id).totp_locked_until is not None
+
+
+def test_right_code_resets_failed_attempts(client: TestClient, engine: Engine, two_factor_user: User) -> None:
+    challenge_token = challenge(client, two_factor_user)
+    for _ in range(settings.FAILED_LOGIN_ATTEMPTS - 1):
+        client.post(LOGIN_2FA_URL, json={"challenge_token": challenge_token, "code": wrong_code(two_factor_user)})
+
+    r = client.post(LOGIN_2FA_URL, json={
+        "challenge_token": challenge_token,
+        "code": pyotp.TOTP(two_factor_user.totp_secret).now(),
+    })
+
+    assert r.status_code == 200
+    with Session(engine) as session:
+        assert session.get(User, two_factor_user.id).totp_failed_attempts == 0
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.api.user.domain.user_models import User
+from app.core.config import settings
+from app.tests.utils.db import captured_statements
+from app.tests.utils.user import auth_headers, create_user, random_email
+
+USERS_URL = f"{settings.API_V1_STR}/users/"
+PAGE_QUERY = "ORDER BY users.created_at"
+
+
+def test_read_users_not_modified_without_page_query(client: TestClient, engine: Engine) -> None:
+    headers = auth_headers(create_user(engine, is_superuser=True))
+    with captured_statements(engine) as statements:
+        r = client.get(USERS_URL, headers=headers)
+    assert r.status_code == 200
+    assert any(PAGE_QUERY in statement for statement in statements)
+    etag = r.headers["ETag"]
+
+    with captured_statements(engine) as statements:
+        r = client.get(USERS_URL, headers={**headers, "If-None-Match": etag})
+
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert not any(PAGE_QUERY in statement for statement in statements)
+
+
+def test_read_users_modified_after_user_write(client: TestClient, engine: Engine) -> None:
+    headers = auth_headers(create_user(engine, is_superuser=True))
+    etag = client.get(USERS_URL, headers=headers).headers["ETag"]
+
+    r = client.post(f"{settings.API_V1_STR}/auth/register", json={"email": random_email(), "password": "password123"})
+    assert r.status_code == 201
+
+    r = client.get(USERS_URL, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["ETag"] != etag
+
+
+def test_read_users_modified_after_user_update_and_delete(client: TestClient, engine: Engine) -> None:
+    headers = auth_headers(create_user(engine, is_superuser=True))
+    other = create_user(engine)
+    etag = client.get(USERS_URL, headers=headers).headers["ETag"]
+
+    with Session(engine) as session:
+        session.get(User, other.id).is_active = False
+        session.commit()
+    r = client.get(USERS_URL, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+
+    with Session(engine) as session:
+        session.delete(session.get(User, other.id))
+        session.commit()
+    r = client.get(USERS_URL, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+
+
+def test_user_writes_share_no_row(client: TestClient, engine: Engine) -> None:
+    with captured_statements(engine) as statements:
+        r = client.post(f"{settings.API_V1_STR}/auth/register", json={"email": random_email(), "password": "password123"})
+
+    assert r.status_code == 201
+    assert not any("catalog_versions" in statement for statement in statements)
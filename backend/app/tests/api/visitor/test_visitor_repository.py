@@ -0,0 +1,101 @@
+import random
+import string
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import Engine, delete
+from sqlmodel import Session, col, or_
+
+from app.api.shared.domain.document_type import DocumentType
+from app.api.visitor.domain.visitor_models import Visitor
+from app.api.visitor.infrastructure.repository.sql.sql_alchemy_visitor_repository import (
+    SQLAlchemyVisitorRepository,
+)
+
+
+def random_letters(length: int = 8) -> str:
+    return "".join(random.choices(string.ascii_lowercase, k=length))
+
+
+def add_visitors(engine: Engine, *visitors: tuple[str, str]) -> None:
+    with Session(engine) as session:
+        for document_number, full_name in visitors:
+            session.add(Visitor(document_type=DocumentType.ID_CARD, document_number=document_number, full_name=full_name))
+        session.commit()
+
+
+def search(engine: Engine, query: str, limit: int = 10) -> list[Visitor]:
+    with Session(engine) as session:
+        return SQLAlchemyVisitorRepository(session).search_sync(query, limit)
+
+
+@pytest.fixture
+def token(postgres_engine: Engine) -> Iterator[str]:
+    """
+    Letters unique to a test, in the document numbers and names of its visitors,
+    so that the shared Postgres keeps no rows behind.
+    """
+    token = random_letters()
+    yield token
+    with Session(postgres_engine) as session:
+        session.exec(delete(Visitor).where(or_(
+            col(Visitor.document_number).startswith(token.upper()),
+            col(Visitor.full_name).contains(token),
+        )))
+        session.commit()
+
+
+def test_search_by_number_prefix_in_order(engine: Engine) -> None:
+    add_visitors(engine, *((number, "Ana Ruiz") for number in ("7710042", "7710041", "7720001", "7710043")))
+
+    found = search(engine, "77.100", 2)
+
+    assert [visitor.document_number for visitor in found] == ["7710041", "7710042"]
+
+
+def test_search_by_name_part(engine: Engine) -> None:
+    # Sorts before "zoe"
+    name = f"q{random_letters(7)}"
+    add_visitors(
+        engine,
+        ("8810001", f"Zoe {name.title()} Ruiz"),
+        ("8810002", f"{name}ez"),
+        ("8810003", "Ana Ruiz"),
+        ("8810004", f"{name[:4]}_{name[4:]}"),
+    )
+
+    found = search(engine, f"  {name.upper()} ")
+
+    # Case and extra spaces are ignored, LIKE wildcards in names are literal
+    assert [visitor.full_name for visitor in found] == [f"{name}ez", f"Zoe {name.title()} Ruiz"]
+    assert [visitor.full_name for visitor in search(engine, f"{name[:4]}_")] == [f"{name[:4]}_{name[4:]}"]
+
+
+def test_search_by_number_prefix_in_byte_order_on_postgres(postgres_engine: Engine, token: str) -> None:
+    prefix = token.upper()
+    add_visitors(
+        postgres_engine,
+        *((f"{prefix}{suffix}", "Ana Ruiz") for suffix in ("1Z", "2", "12", "1", "10", "A1"))
+    )
+
+    found = search(postgres_engine, f"{token}-1")
+
+    # "C" collation: byte order, digits before letters, no locale rules
+    assert [visitor.document_number for visitor in found] == [
+        f"{prefix}1", f"{prefix}10", f"{prefix}12", f"{prefix}1Z"
+    ]
+
+
+def test_search_by_name_closest_word_first_on_postgres(postgres_engine: Engine, token: str) -> None:
+    add_visitors(
+        postgres_engine,
+        (f"{token.upper()}1", f"{token}ez"),
+        (f"{token.upper()}2", f"Zoe {token.title()}"),
+        (f"{token.upper()}3", "Ana Ruiz"),
+    )
+
+    found = search(postgres_engine, token)
+
+    # The whole word matches better than a word starting with it, against the
+    # alphabetical order other databases fall back to
+    assert [visitor.full_name for visitor in found] == [f"Zoe {token.title()}", f"{token}ez"]
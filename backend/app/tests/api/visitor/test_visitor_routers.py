@@ -0,0 +1,48 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.api.shared.domain.document_type import DocumentType
+from app.api.visitor.domain.visitor_models import Visitor
+from app.core.config import settings
+from app.tests.utils.user import auth_headers, create_user
+
+SEARCH_URL = f"{settings.API_V1_STR}/visitors/search"
+
+
+def add_visitors(engine: Engine, *visitors: tuple[str, str]) -> None:
+    with Session(engine) as session:
+        for document_number, full_name in visitors:
+            session.add(Visitor(document_type=DocumentType.ID_CARD, document_number=document_number, full_name=full_name))
+        session.commit()
+
+
+def test_search_visitors_by_document_number(client: TestClient, engine: Engine) -> None:
+    add_visitors(engine, ("6610002", "Ana Ruiz"), ("6610001", "Luis Mora"), ("6620001", "Eva Sanz"))
+
+    r = client.get(SEARCH_URL, headers=auth_headers(create_user(engine)), params={"q": "66.10"})
+
+    assert r.status_code == 200
+    assert r.json()["count"] == 2
+    assert [visitor["document_number"] for visitor in r.json()["visitors"]] == ["6610001", "6610002"]
+
+
+def test_search_visitors_by_name(client: TestClient, engine: Engine) -> None:
+    add_visitors(engine, ("6630001", "Quirino Velasquez"), ("6630002", "Berta Quirinoz"), ("6630003", "Ana Ruiz"))
+
+    r = client.get(SEARCH_URL, headers=auth_headers(create_user(engine)), params={"q": "quirino", "limit": 1})
+
+    assert r.status_code == 200
+    assert r.json()["count"] == 1
+    assert [visitor["full_name"] for visitor in r.json()["visitors"]] == ["Berta Quirinoz"]
+
+
+def test_search_visitors_validates_query(client: TestClient, engine: Engine) -> None:
+    headers = auth_headers(create_user(engine))
+
+    assert client.get(SEARCH_URL, headers=headers, params={"q": "a"}).status_code == 422
+    assert client.get(SEARCH_URL, headers=headers, params={"q": "ana", "limit": 51}).status_code == 422
+
+
+def test_search_visitors_requires_token(client: TestClient) -> None:
+    assert client.get(SEARCH_URL, params={"q": "ana"}).status_code == 401
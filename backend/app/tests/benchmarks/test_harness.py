@@ -0,0 +1,39 @@
+import pytest
+
+from app.benchmarks.harness import (
+    CALIBRATION,
+    BenchmarkReport,
+    compare_to_baseline,
+    noise,
+    summarize,
+)
+
+
+def report(calibration: float, timing: float, timing_noise: float = 0.0) -> BenchmarkReport:
+    calibrated = summarize(CALIBRATION, [calibration] * 10)
+    result = summarize("bench", [timing] * 10).model_copy(update={"noise": timing_noise})
+    return BenchmarkReport(suite="test", results=[calibrated, result])
+
+
+def test_noise_is_the_spread_of_batch_minimums() -> None:
+    assert noise([1.0] * 10) == 0.0
+    assert noise([1.0, 9.0, 1.0, 9.0, 1.2, 9.0, 1.0, 9.0, 1.0, 9.0]) == pytest.approx(0.2)
+    # Too few samples to batch
+    assert noise([1.0, 2.0]) == 0.0
+
+
+def test_baseline_is_scaled_to_the_machine() -> None:
+    baseline = report(calibration=1.0, timing=1.0)
+
+    # Twice slower on a machine twice slower
+    assert compare_to_baseline(report(calibration=2.0, timing=2.0), baseline, 0.1) == []
+    # Twice slower on the same machine
+    [regression] = compare_to_baseline(report(calibration=1.0, timing=2.0), baseline, 0.1)
+    assert regression.startswith("bench: min 2000000.000 us is 100.0% slower")
+
+
+def test_noise_widens_the_threshold() -> None:
+    baseline = report(calibration=1.0, timing=1.0)
+
+    assert compare_to_baseline(report(calibration=1.0, timing=1.25, timing_noise=0.2), baseline, 0.1) == []
+    assert compare_to_baseline(report(calibration=1.0, timing=1.35, timing_noise=0.2), baseline, 0.1) != []
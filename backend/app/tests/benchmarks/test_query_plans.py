@@ -0,0 +1,7 @@
+from sqlalchemy import Engine
+
+from app.benchmarks.query_plans import check
+
+
+def test_hot_queries_use_indexes(postgres_engine: Engine) -> None:
+    assert check(postgres_engine.url.render_as_string(hide_password=False), rows=5000) == []
@@ -0,0 +1,66 @@
+import os
+import sys
+from collections.abc import Iterator
+
+# Cheap password hashes and no rate limits, before the settings are loaded
+os.environ["PASSWORD_BCRYPT_ROUNDS"] = "4"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import Engine, create_engine, event, text  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.benchmarks.harness import create_benchmark_engine  # noqa: E402
+from app.core import db  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Engine]:
+    """
+    A SQLite file database standing in for Postgres, used by every module that
+    opens its own sessions through `get_engine`.
+    """
+    engine = create_benchmark_engine(f"sqlite:///{tmp_path_factory.mktemp('db') / 'app.db'}")
+
+    @event.listens_for(engine, "connect")
+    def enforce_foreign_keys(dbapi_connection, _connection_record) -> None:
+        # Off by default in SQLite, always on in Postgres
+        dbapi_connection.execute("PRAGMA foreign_keys = ON")
+
+    # Drop the connection that created the tables, opened before the listener
+    engine.dispose()
+    get_engine = db.get_engine
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        for name, module in list(sys.modules.items()):
+            if name.startswith("app.") and getattr(module, "get_engine", None) is get_engine:
+                monkeypatch.setattr(module, "get_engine", lambda: engine)
+        yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(engine: Engine) -> Iterator[TestClient]:  # noqa: ARG001, the app must run on the test engine
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def postgres_engine() -> Iterator[Engine]:
+    """
+    The configured Postgres, for what SQLite cannot stand in for (COPY, plans).
+    Tests using it are skipped unless it is reachable and migrated, as in CI.
+    """
+    engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI), connect_args={"connect_timeout": 2})
+    try:
+        with engine.connect() as connection:
+            migrated = connection.execute(text("SELECT to_regclass('alembic_version') IS NOT NULL")).scalar_one()
+    except OperationalError:
+        migrated = False
+    if not migrated:
+        engine.dispose()
+        pytest.skip("Needs the configured Postgres with the migrations applied")
+    yield engine
+    engine.dispose()
@@ -0,0 +1,34 @@
+import asyncio
+
+from sqlalchemy import Engine
+from sqlmodel import Session
+
+from app.api.user.domain.user_models import User
+from app.core.db_executor import run_in_session
+from app.tests.utils.user import create_user
+
+
+def test_read_releases_connection(engine: Engine) -> None:
+    user = create_user(engine)
+
+    with Session(engine, expire_on_commit=False) as session:
+        loaded = asyncio.run(run_in_session(session, session.get, User, user.id))
+
+        assert not session.in_transaction()
+        assert engine.pool.checkedout() == 0
+        # Still loaded, read without a query
+        assert "email" in loaded.__dict__
+        assert loaded.email == user.email
+
+
+def test_pending_changes_keep_connection(engine: Engine) -> None:
+    user = create_user(engine)
+
+    with Session(engine, expire_on_commit=False) as session:
+        loaded = asyncio.run(run_in_session(session, session.get, User, user.id))
+        loaded.is_active = False
+        asyncio.run(run_in_session(session, session.get, User, user.id))
+
+        assert session.in_transaction()
+        assert session.dirty
+        session.rollback()
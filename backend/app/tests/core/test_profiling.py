@@ -0,0 +1,79 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+
+from app.core.config import settings
+from app.core.profiling import (
+    PROFILE_ID_HEADER,
+    PROFILE_STATUS_HEADER,
+    ProfileRateLimiter,
+    write_collapsed_stacks,
+)
+from app.tests.utils.user import auth_headers, create_user
+
+
+@pytest.fixture
+def profile_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "PROFILING_OUTPUT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_profile_written_for_superuser(client: TestClient, engine: Engine, profile_dir: Path) -> None:
+    superuser = create_user(engine, is_superuser=True)
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers={**auth_headers(superuser), "X-Profile": "1"})
+
+    assert r.status_code == 200
+    assert r.headers[PROFILE_STATUS_HEADER] == "profiled"
+    assert (profile_dir / f"{r.headers[PROFILE_ID_HEADER]}.collapsed").is_file()
+
+
+def test_no_profile_for_regular_user(client: TestClient, engine: Engine, profile_dir: Path) -> None:
+    user = create_user(engine)
+
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers={**auth_headers(user), "X-Profile": "1"})
+
+    assert r.status_code == 200
+    assert PROFILE_ID_HEADER not in r.headers
+    assert PROFILE_STATUS_HEADER not in r.headers
+    assert not list(profile_dir.iterdir())
+
+
+def test_no_profile_without_token(client: TestClient, profile_dir: Path) -> None:
+    r = client.get(f"{settings.API_V1_STR}/users/me", params={"_profile": "1"})
+
+    assert r.status_code == 401
+    assert PROFILE_ID_HEADER not in r.headers
+    assert not list(profile_dir.iterdir())
+
+
+def test_rate_limiter_rejects_concurrent_profile() -> None:
+    limiter = ProfileRateLimiter(per_minute=60)
+
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+
+
+def test_rate_limiter_rejects_over_rate() -> None:
+    limiter = ProfileRateLimiter(per_minute=1)
+
+    assert limiter.try_acquire()
+    limiter.release()
+    assert not limiter.try_acquire()
+
+
+def test_collapsed_stacks_written(tmp_path: Path) -> None:
+    samples = Counter({"MainThread;app.main:handler;app.core.db:query": 3, "MainThread;app.main:handler": 1})
+
+    path = write_collapsed_stacks(samples, tmp_path, "profile")
+
+    assert path == tmp_path / "profile.collapsed"
+    assert path.read_text().splitlines() == [
+        "MainThread;app.main:handler;app.core.db:query 3",
+        "MainThread;app.main:handler 1",
+    ]
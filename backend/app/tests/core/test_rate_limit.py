@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+
+import pytest
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import TokenBucketStore, client_address
+
+
+def request_from(peer: str, forwarded_for: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 1234)})
+
+
+@pytest.fixture
+def trusted(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", ["10.0.0.0/8"])
+    rate_limit.trusted_proxies.cache_clear()
+    rate_limit.is_trusted_proxy.cache_clear()
+    yield
+    rate_limit.trusted_proxies.cache_clear()
+    rate_limit.is_trusted_proxy.cache_clear()
+
+
+def test_forwarded_for_ignored_without_trusted_proxies() -> None:
+    assert client_address(request_from("10.0.0.2", "203.0.113.7")) == "10.0.0.2"
+
+
+@pytest.mark.usefixtures("trusted")
+def test_forwarded_for_from_trusted_proxy() -> None:
+    assert client_address(request_from("10.0.0.2", "203.0.113.7")) == "203.0.113.7"
+
+
+@pytest.mark.usefixtures("trusted")
+def test_forwarded_for_skips_trusted_hops_from_the_right() -> None:
+    # The client forged the first address, then went through two trusted proxies
+    request = request_from("10.0.0.2", "198.51.100.1, 203.0.113.7, 10.0.0.3")
+
+    assert client_address(request) == "203.0.113.7"
+
+
+@pytest.mark.usefixtures("trusted")
+def test_forwarded_for_ignored_from_untrusted_peer() -> None:
+    assert client_address(request_from("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+
+def test_token_bucket() -> None:
+    store = TokenBucketStore(rate=1.0, capacity=2, max_keys=10)
+
+    assert store.hit("a", now=0.0) == 0
+    assert store.hit("a", now=0.0) == 0
+    assert store.hit("a", now=0.0) == pytest.approx(1.0)
+    assert store.hit("b", now=0.0) == 0
+    assert store.hit("a", now=1.0) == 0
@@ -0,0 +1,61 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import security
+from app.main import app
+
+
+def test_dummy_hash_built_at_startup() -> None:
+    security.get_dummy_hashed_password.cache_clear()
+
+    with TestClient(app):
+        assert security.get_dummy_hashed_password.cache_info().currsize == 1
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [1000.0]
+    monkeypatch.setattr(security.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_totp_replay_cache_rejects_reuse() -> None:
+    cache = security.TotpReplayCache(ttl=90, max_size=10)
+
+    assert cache.use("user", "123456")
+    assert not cache.use("user", "123456")
+    # Codes are remembered per user
+    assert cache.use("other", "123456")
+    assert cache.use("user", "654321")
+
+
+def test_totp_replay_cache_expires(clock: list[float]) -> None:
+    cache = security.TotpReplayCache(ttl=90, max_size=10)
+    cache.use("user", "123456")
+
+    clock[0] += 89
+    assert not cache.use("user", "123456")
+    clock[0] += 1
+    assert cache.use("user", "123456")
+
+
+def test_totp_replay_cache_drops_expired_entries(clock: list[float]) -> None:
+    cache = security.TotpReplayCache(ttl=90, max_size=10)
+    for code in ("000001", "000002", "000003"):
+        cache.use("user", code)
+
+    clock[0] += 90
+    cache.use("user", "000004")
+
+    assert len(cache._used) == 1
+
+
+def test_totp_replay_cache_evicts_oldest_when_full() -> None:
+    cache = security.TotpReplayCache(ttl=90, max_size=3)
+    for code in ("000001", "000002", "000003", "000004"):
+        assert cache.use("user", code)
+
+    assert len(cache._used) == 3
+    # The oldest code was evicted before it expired, the newer ones are kept
+    assert cache.use("user", "000001")
+    assert not cache.use("user", "000004")
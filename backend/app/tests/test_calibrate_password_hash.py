@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from app import calibrate_password_hash
+
+
+@pytest.fixture
+def hash_times(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    # Each extra round doubles the hash time, 10 rounds take 50 ms
+    measured: list[int] = []
+
+    def measure(rounds: int, _samples: int) -> float:
+        measured.append(rounds)
+        return 50.0 * 2 ** (rounds - 10)
+
+    monkeypatch.setattr(calibrate_password_hash, "measure", measure)
+    return measured
+
+
+def test_calibrate_recommends_highest_cost_within_target(hash_times: list[int]) -> None:
+    assert calibrate_password_hash.calibrate(target_ms=250, min_rounds=10, samples=1) == 12
+    # Stops at the first cost over the target
+    assert hash_times == [10, 11, 12, 13]
+
+
+@pytest.mark.usefixtures("hash_times")
+def test_calibrate_never_goes_below_min_rounds() -> None:
+    assert calibrate_password_hash.calibrate(target_ms=10, min_rounds=10, samples=1) == 10
+
+
+def test_measure_times_real_hashes() -> None:
+    assert calibrate_password_hash.measure(rounds=4, samples=2) > 0
+
+
+def test_write_env_replaces_rounds(tmp_path: Path) -> None:
+    env = tmp_path / ".env"
+    env.write_text("DOMAIN=localhost\nPASSWORD_BCRYPT_ROUNDS=10\nPROJECT_NAME=qr-access\n")
+
+    calibrate_password_hash.write_env(env, 13)
+
+    assert env.read_text() == "DOMAIN=localhost\nPASSWORD_BCRYPT_ROUNDS=13\nPROJECT_NAME=qr-access\n"
+
+
+def test_write_env_appends_rounds(tmp_path: Path) -> None:
+    env = tmp_path / ".env"
+    env.write_text("DOMAIN=localhost")
+
+    calibrate_password_hash.write_env(env, 13)
+    calibrate_password_hash.write_env(tmp_path / "new.env", 11)
+
+    assert env.read_text() == "DOMAIN=localhost\nPASSWORD_BCRYPT_ROUNDS=13\n"
+    assert (tmp_path / "new.env").read_text() == "PASSWORD_BCRYPT_ROUNDS=11\n"
+
+
+@pytest.mark.usefixtures("hash_times")
+def test_main_writes_recommendation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    env = tmp_path / ".env"
+    monkeypatch.setattr(
+        "sys.argv",
+        ["calibrate_password_hash", "--target-ms", "100", "--samples", "1", "--write-env", str(env)],
+    )
+
+    calibrate_password_hash.main()
+
+    assert env.read_text() == "PASSWORD_BCRYPT_ROUNDS=11\n"
@@ -0,0 +1,126 @@
+import io
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, delete
+from sqlmodel import Session, col, select
+
+from app import import_users as import_users_module
+from app.api.user.domain.user_models import User
+from app.import_users import ImportStats, import_users, parse_records, read_rows
+
+IMPORT_DOMAIN = "import.qr-access.invalid"
+
+
+def test_malformed_ndjson_lines_are_rejected() -> None:
+    file = io.StringIO(
+        '{"email": "a@example.com", "password": "password123"}\n'
+        '{"email": "b@example.com", "password": \n'
+        '["c@example.com", "password123"]\n'
+        '\n'
+        '"d@example.com"\n'
+        '{"email": "e@example.com", "password": "password123"}\n'
+    )
+    rejects = io.StringIO()
+    stats = ImportStats()
+
+    records = list(parse_records(read_rows(file, "ndjson"), rejects, stats))
+
+    assert [record.email for record in records] == ["a@example.com", "e@example.com"]
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [line["line"] for line in rejected] == [2, 3, 5]
+    assert rejected[0]["reason"].startswith("Malformed JSON")
+    assert rejected[1]["reason"] == "Expected a JSON object, got list"
+    assert (stats.read, stats.rejected) == (5, 3)
+
+
+def test_invalid_roles_are_rejected() -> None:
+    file = io.StringIO(
+        '{"email": "a@example.com", "password": "password123", "role": ["admin"]}\n'
+        '{"email": "b@example.com", "password": "password123", "role": {"name": "admin"}}\n'
+        '{"email": "c@example.com", "password": "password123", "role": "admin"}\n'
+        '{"email": ["d@example.com"], "password": "password123"}\n'
+    )
+    rejects = io.StringIO()
+    stats = ImportStats()
+
+    records = list(parse_records(read_rows(file, "ndjson"), rejects, stats))
+
+    assert [(record.email, record.role) for record in records] == [("c@example.com", "admin")]
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    assert [(line["line"], line["email"]) for line in rejected] == [
+        (1, "a@example.com"), (2, "b@example.com"), (4, None)
+    ]
+    assert all(line["reason"].startswith("role: ") for line in rejected[:2])
+
+
+def import_file(tmp_path: Path, lines: list[dict]) -> tuple[ImportStats, list[dict]]:
+    path = tmp_path / "users.ndjson"
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+    rejects = io.StringIO()
+    stats = import_users(path, "ndjson", rejects, batch_size=10, workers=1)
+    rejected = [json.loads(line) for line in rejects.getvalue().splitlines()]
+    return stats, sorted(rejected, key=lambda line: line["line"])
+
+
+@pytest.fixture
+def import_engine(postgres_engine: Engine, monkeypatch: pytest.MonkeyPatch) -> Iterator[Engine]:
+    monkeypatch.setattr(import_users_module, "get_engine", lambda: postgres_engine)
+    yield postgres_engine
+    with Session(postgres_engine) as session:
+        session.exec(delete(User).where(col(User.email).endswith(f"@{IMPORT_DOMAIN}")))
+        session.commit()
+
+
+def test_import_users_merges_and_rejects(tmp_path: Path, import_engine: Engine) -> None:
+    existing = f"existing@{IMPORT_DOMAIN}"
+    with Session(import_engine) as session:
+        session.add(User(email=existing, hashed_password="x"))
+        session.commit()
+
+    stats, rejected = import_file(tmp_path, [
+        {"email": f"a@{IMPORT_DOMAIN}", "password": "password123"},
+        {"email": existing, "password": "password123"},
+        {"email": f"b@{IMPORT_DOMAIN}", "password": "password123", "role": "no-such-role"},
+        {"email": f"A@{IMPORT_DOMAIN}", "password": "password123"},
+        {"email": f"c@{IMPORT_DOMAIN}", "password": "password123", "is_superuser": True},
+    ])
+
+    assert (stats.read, stats.imported, stats.rejected) == (5, 2, 3)
+    assert [(line["line"], line["reason"]) for line in rejected] == [
+        (2, "already exists"), (3, "unknown role"), (4, "duplicate in input")
+    ]
+    with Session(import_engine) as session:
+        imported = session.exec(select(User).where(col(User.email).in_([f"a@{IMPORT_DOMAIN}", f"c@{IMPORT_DOMAIN}"])))
+        assert sorted((user.email, user.is_superuser) for user in imported) == [
+            (f"a@{IMPORT_DOMAIN}", False), (f"c@{IMPORT_DOMAIN}", True)
+        ]
+
+
+def test_import_users_rejects_rows_lost_to_a_concurrent_insert(
+        tmp_path: Path, import_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    racing = f"racing@{IMPORT_DOMAIN}"
+    reject = import_users_module.reject
+
+    def register_racing_user(*args) -> None:
+        # Someone registers the email after the batch was checked, before it is merged
+        if not raced:
+            raced.append(racing)
+            with Session(import_engine) as session:
+                session.add(User(email=racing, hashed_password="x"))
+                session.commit()
+        reject(*args)
+
+    raced: list[str] = []
+    monkeypatch.setattr(import_users_module, "reject", register_racing_user)
+
+    stats, rejected = import_file(tmp_path, [
+        {"email": f"d@{IMPORT_DOMAIN}", "password": "password123", "role": "no-such-role"},
+        {"email": racing, "password": "password123"},
+    ])
+
+    assert (stats.read, stats.imported, stats.rejected) == (2, 0, 2)
+    assert rejected[1] == {"line": 2, "email": racing, "reason": "already exists"}
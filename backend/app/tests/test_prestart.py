@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app import prestart
+
+MIGRATION = '''
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        op.execute("CREATE TABLE prestart_probe (id INTEGER)")
+
+
+def downgrade():
+    op.execute("DROP TABLE prestart_probe")
+'''
+
+
+def test_run_migrations_outside_a_transaction(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    (versions / "0001_autocommit.py").write_text(MIGRATION)
+    # The real env.py and logging setup, with a migration that commits early like
+    # the CREATE INDEX CONCURRENTLY ones
+    ini = prestart.ALEMBIC_INI.read_text().replace(
+        "script_location = app/alembic",
+        f"script_location = {prestart.ALEMBIC_INI.parent / 'app' / 'alembic'}\nversion_locations = {versions}\npath_separator = os",
+    )
+    (tmp_path / "alembic.ini").write_text(ini)
+    monkeypatch.setattr(prestart, "ALEMBIC_INI", tmp_path / "alembic.ini")
+    engine = create_engine(f"sqlite:///{tmp_path / 'prestart.db'}")
+
+    prestart.run_migrations(engine)
+
+    assert inspect(engine).has_table("prestart_probe")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar_one() == "0001"
@@ -0,0 +1,34 @@
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import Engine
+from sqlmodel import Session, select
+
+from app.api.shared.infrastructure.outbox.outbox_models import OutboxMessage
+from app.api.user.domain.user_events import UserRegistered
+from app.api.user.domain.user_models import User
+from app.core import security
+
+
+def random_email() -> str:
+    return f"{uuid.uuid4().hex}@example.com"
+
+
+def create_user(engine: Engine, password: str = "password123", **fields) -> User:
+    user = User(email=random_email(), hashed_password=security.get_password_hash(password), **fields)
+    with Session(engine, expire_on_commit=False) as session:
+        session.add(user)
+        session.commit()
+    return user
+
+
+def auth_headers(user: User) -> dict[str, str]:
+    token, _ = security.create_access_token(str(user.id), security.ACCESS_AUD, timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def registered_events(engine: Engine, email: str) -> list[OutboxMessage]:
+    """The `UserRegistered` messages of an email in the outbox."""
+    with Session(engine) as session:
+        messages = session.exec(select(OutboxMessage).where(OutboxMessage.event_type == UserRegistered.event_type))
+        return [message for message in messages if message.payload["email"] == email]
@@ -3,11 +3,5 @@
 set -e
 set -x
 
-# Let the DB start
-python app/backend_pre_start.py
-
-# Run migrations
-alembic upgrade head
-
-# Create initial data in DB
-python app/initial_data.py
\ No newline at end of file
+# Wait for the DB, run migrations and create initial data in one process
+python app/prestart.py